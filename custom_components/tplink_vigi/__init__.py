@@ -3,21 +3,49 @@
 from __future__ import annotations
 
 import logging
+from pathlib import Path
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .activity import async_setup_activity_sweep
+from .capture import CaptureWriter
+from .const import (
+    CAPTURE_DIR,
+    CONF_CAPTURE,
+    CONF_ISOLATED_INGEST,
+    DATA_DISPATCHER,
+    DATA_HISTORY,
+    DATA_PULLER,
+    DATA_SNAPSHOTS,
+    DEFAULT_CAPTURE,
+    DEFAULT_ISOLATED_INGEST,
+    DOMAIN,
+    HISTORY_FILE,
+    SNAPSHOT_DIR,
+)
+from .events import EventDispatcher
+from .history import EventHistory
+from .ingest import IngestWorker
+from .pull import SnapshotPuller
+from .services import async_setup_services
+from .snapshots import SnapshotStore, SnapshotView, ThumbnailView
 
 _LOGGER = logging.getLogger(__name__)
 
 # This integration only supports config entry setup (UI configuration)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.IMAGE]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.IMAGE,
+    Platform.CAMERA,
+    Platform.SENSOR,
+]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
@@ -27,6 +55,37 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     YAML configuration is no longer supported.
     """
     hass.data.setdefault(DOMAIN, {})
+
+    # Integration-wide event history, shared by all entries
+    history = EventHistory(hass, Path(hass.config.path(DOMAIN, HISTORY_FILE)))
+    hass.data[DATA_HISTORY] = history
+
+    # Stored snapshots, indexed in the history and served to the media browser
+    hass.data[DATA_SNAPSHOTS] = SnapshotStore(
+        hass, Path(hass.config.path(DOMAIN, SNAPSHOT_DIR)), history
+    )
+    hass.http.register_view(SnapshotView())
+    hass.http.register_view(ThumbnailView())
+
+    # Snapshot pulls for JSON-only events share Home Assistant's pooled session
+    hass.data[DATA_PULLER] = SnapshotPuller(async_get_clientsession(hass))
+
+    # Integration-wide bus event dispatcher, batching cameras that share a window
+    dispatcher = EventDispatcher(hass)
+    hass.data[DATA_DISPATCHER] = dispatcher
+
+    # One sweep refreshes the activity entities of every camera
+    stop_sweep = async_setup_activity_sweep(hass)
+
+    async def async_close_history(event: Event) -> None:
+        """Deliver batched events and commit queued history on shutdown."""
+        stop_sweep()
+        dispatcher.async_flush()
+        await history.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_history)
+
+    async_setup_services(hass)
     return True
 
 
@@ -38,7 +97,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = {
         "entry": entry,
         "cameras": {},
+        CONF_CAPTURE: None,
+        CONF_ISOLATED_INGEST: None,
     }
+    cameras = entry.data.get("cameras", [])
+
+    # Raw webhook capture is opt-in per camera; one writer serves the entry
+    if any(camera.get(CONF_CAPTURE, DEFAULT_CAPTURE) for camera in cameras):
+        hass.data[DOMAIN][entry.entry_id][CONF_CAPTURE] = CaptureWriter(
+            hass, Path(hass.config.path(DOMAIN, CAPTURE_DIR, entry.entry_id))
+        )
+
+    # Isolated ingest moves payload parsing to a dedicated worker thread
+    if any(
+        camera.get(CONF_ISOLATED_INGEST, DEFAULT_ISOLATED_INGEST)
+        for camera in cameras
+    ):
+        hass.data[DOMAIN][entry.entry_id][CONF_ISOLATED_INGEST] = IngestWorker()
 
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -61,7 +136,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         # Clean up entry data
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+
+        # Flush any capture records still queued for disk
+        if entry_data and entry_data.get(CONF_CAPTURE) is not None:
+            await entry_data[CONF_CAPTURE].async_close()
+
+        if entry_data and entry_data.get(CONF_ISOLATED_INGEST) is not None:
+            entry_data[CONF_ISOLATED_INGEST].shutdown()
 
         _LOGGER.info("TP-Link VIGI integration unloaded")
 
@@ -0,0 +1,113 @@
+"""Camera activity tracking for TP-Link VIGI cameras.
+
+Tells a calm scene apart from a camera that stopped posting. Each webhook
+updates a per-camera tracker in constant time: the event rate is an
+exponentially weighted moving average that decays continuously, so it
+never needs a per-camera timer. One integration-wide sweep then tells
+all rate, silence and liveness entities to refresh.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    ACTIVITY_SWEEP_INTERVAL,
+    EVENT_RATE_TIME_CONSTANT,
+    SIGNAL_ACTIVITY_SWEEP,
+)
+
+
+class ActivityTracker:
+    """Webhook rate and silence for one camera."""
+
+    __slots__ = ("silence_threshold", "webhooks", "_since", "_last_seen", "_rate")
+
+    def __init__(self, silence_threshold: float) -> None:
+        """Initialize the tracker.
+
+        Args:
+            silence_threshold: Seconds without a webhook before the
+                camera counts as silent
+        """
+        self.silence_threshold = silence_threshold
+        self.webhooks = 0
+        # Start of tracking stands in for the last webhook until one arrives
+        self._since = time.monotonic()
+        self._last_seen: float | None = None
+        # Events per second as of _last_seen
+        self._rate = 0.0
+
+    def record(self, now: float | None = None) -> None:
+        """Count one webhook.
+
+        Args:
+            now: ``time.monotonic()`` of the webhook; defaults to now
+        """
+        if now is None:
+            now = time.monotonic()
+        self._rate = self.rate_at(now) + 1 / EVENT_RATE_TIME_CONSTANT
+        self._last_seen = now
+        self.webhooks += 1
+
+    def rate_at(self, now: float) -> float:
+        """Return the decayed event rate (events per second) at ``now``."""
+        if self._last_seen is None:
+            return 0.0
+        elapsed = max(now - self._last_seen, 0.0)
+        return self._rate * math.exp(-elapsed / EVENT_RATE_TIME_CONSTANT)
+
+    @property
+    def events_per_minute(self) -> float:
+        """Return the current event rate in events per minute."""
+        return self.rate_at(time.monotonic()) * 60
+
+    @property
+    def silence(self) -> float | None:
+        """Return seconds since the last webhook, or None if none arrived."""
+        if self._last_seen is None:
+            return None
+        return time.monotonic() - self._last_seen
+
+    @property
+    def alive(self) -> bool:
+        """Return True unless the camera has been silent past the threshold."""
+        last = self._last_seen if self._last_seen is not None else self._since
+        return time.monotonic() - last < self.silence_threshold
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return activity state for diagnostics."""
+        silence = self.silence
+        return {
+            "webhooks": self.webhooks,
+            "events_per_minute": round(self.events_per_minute, 3),
+            "silence_seconds": round(silence, 1) if silence is not None else None,
+            "silence_threshold": self.silence_threshold,
+            "alive": self.alive,
+        }
+
+
+def async_setup_activity_sweep(hass: HomeAssistant) -> Callable[[], None]:
+    """Start the shared sweep that refreshes every camera's activity entities.
+
+    Returns:
+        Callback that stops the sweep.
+    """
+
+    @callback
+    def _async_sweep(_now: datetime) -> None:
+        """Tell all activity entities to re-read their tracker."""
+        async_dispatcher_send(hass, SIGNAL_ACTIVITY_SWEEP)
+
+    unsub: Callable[[], None] = async_track_time_interval(
+        hass, _async_sweep, timedelta(seconds=ACTIVITY_SWEEP_INTERVAL)
+    )
+    return unsub
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+import heapq
+import itertools
 import logging
 from typing import Any
 
+from aiohttp import web
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
@@ -17,18 +21,70 @@ from homeassistant.components.webhook import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
+from .capture import CaptureWriter
 from .const import (
     CONF_CAMERA_ID,
+    CONF_CAPTURE,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_ISOLATED_INGEST,
+    CONF_PERCEPTUAL_DEDUP,
+    CONF_RATE_LIMIT,
     CONF_RESET_DELAY,
+    CONF_RESTRICT_SOURCE,
+    CONF_SILENCE_THRESHOLD,
+    CONF_SNAPSHOT_URL,
+    CONF_STORE_SNAPSHOTS,
     CONF_WEBHOOK_ID,
+    DEFAULT_CAPTURE,
+    DEFAULT_EVENT_BATCH_WINDOW,
+    DEFAULT_ISOLATED_INGEST,
+    DEFAULT_PERCEPTUAL_DEDUP,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_RESET_DELAY,
+    DEFAULT_RESTRICT_SOURCE,
+    DEFAULT_SILENCE_THRESHOLD,
+    DEFAULT_SNAPSHOT_URL,
+    DEFAULT_STORE_SNAPSHOTS,
+    DATA_DISPATCHER,
+    DATA_HISTORY,
+    DATA_PULLER,
+    DATA_SNAPSHOTS,
     DOMAIN,
+    MAX_CAMERA_FRAME_BYTES,
+    MAX_EVENT_FRAME_BYTES,
+    EVENT_REORDER_WINDOW,
+    MAX_EVENT_FRAMES,
+    SIGNAL_ACTIVITY_SWEEP,
+    SIGNAL_CAMERA_EVENT,
+)
+from .activity import ActivityTracker
+from .clock import ClockSkewEstimator, parse_vigi_datetime
+from .dedup import SnapshotDeduplicator, image_digest
+from .events import EventDispatcher
+from .gate import REJECT_STATUS, WebhookGate
+from .history import EventHistory
+from .ingest import IngestWorker
+from .imageinfo import ImageInfo, salvage_jpeg, scan_image
+from .ingestlog import IngestLog
+from .payload import (
+    BufferedRequest,
+    FrameBudget,
+    FrameReservation,
+    UploadStats,
+    read_part_salvaging,
 )
+from .pull import SnapshotPuller
+from .snapshots import SnapshotStore
+from .stream import FrameBroadcaster
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,7 +97,7 @@ async def async_setup_entry(
     """Set up binary sensors from config entry."""
     cameras = entry.data.get("cameras", [])
 
-    sensors: list[VigiCameraBinarySensor] = []
+    sensors: list[BinarySensorEntity] = []
 
     for camera in cameras:
         camera_name: str = camera[CONF_NAME]
@@ -77,6 +133,38 @@ async def async_setup_entry(
             "last_image": None,
             "last_image_time": None,
             "last_image_size": None,
+            "last_image_digest": None,
+            "last_image_content_type": None,
+            "last_frames": [],
+            "last_frames_info": [],
+            "last_image_info": None,
+            "last_image_partial": False,
+            CONF_CAPTURE: camera.get(CONF_CAPTURE, DEFAULT_CAPTURE),
+            CONF_ISOLATED_INGEST: camera.get(
+                CONF_ISOLATED_INGEST, DEFAULT_ISOLATED_INGEST
+            ),
+            "handler": None,
+            "gate": WebhookGate(
+                camera.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                camera.get(CONF_RESTRICT_SOURCE, DEFAULT_RESTRICT_SOURCE),
+            ),
+            "dedup": SnapshotDeduplicator(
+                camera.get(CONF_PERCEPTUAL_DEDUP, DEFAULT_PERCEPTUAL_DEDUP)
+            ),
+            "broadcaster": FrameBroadcaster(),
+            "skew": ClockSkewEstimator(),
+            "uploads": UploadStats(),
+            "frame_budget": FrameBudget(MAX_CAMERA_FRAME_BYTES),
+            CONF_EVENT_BATCH_WINDOW: camera.get(
+                CONF_EVENT_BATCH_WINDOW, DEFAULT_EVENT_BATCH_WINDOW
+            ),
+            CONF_STORE_SNAPSHOTS: camera.get(
+                CONF_STORE_SNAPSHOTS, DEFAULT_STORE_SNAPSHOTS
+            ),
+            CONF_SNAPSHOT_URL: camera.get(CONF_SNAPSHOT_URL, DEFAULT_SNAPSHOT_URL),
+            "activity": ActivityTracker(
+                camera.get(CONF_SILENCE_THRESHOLD, DEFAULT_SILENCE_THRESHOLD) * 60
+            ),
         }
 
         # Create binary sensor entity
@@ -84,6 +172,12 @@ async def async_setup_entry(
             hass, entry, camera_id, camera_name, webhook_id, reset_delay
         )
         sensors.append(sensor)
+        sensors.append(VigiLivenessBinarySensor(hass, entry, camera_id, camera_name))
+
+        # Expose the handler so captured traffic can be replayed through it
+        hass.data[DOMAIN][entry.entry_id]["cameras"][camera_id]["handler"] = (
+            sensor.handle_webhook
+        )
 
         # Unregister webhook if it already exists (prevents "Handler already defined" error)
         try:
@@ -134,6 +228,74 @@ async def async_unload_entry(
     return True
 
 
+class VigiEvent:
+    """A parsed detection waiting to be applied to a camera."""
+
+    __slots__ = (
+        "device_name",
+        "ip",
+        "mac",
+        "event_types",
+        "device_time",
+        "event_time",
+        "received",
+        "skew",
+        "frames",
+        "frames_info",
+        "partial",
+        "replayed",
+        "reservation",
+    )
+
+    def __init__(
+        self,
+        device_name: str,
+        ip: str,
+        mac: str,
+        event_types: list[str],
+        device_time: datetime | None,
+        event_time: datetime | None,
+        received: datetime,
+        skew: float | None,
+        frames: list[tuple[bytes, str]],
+        partial: bool = False,
+        replayed: bool = False,
+    ) -> None:
+        """Initialize the event."""
+        self.device_name = device_name
+        self.ip = ip
+        self.mac = mac
+        self.event_types = event_types
+        self.device_time = device_time
+        self.event_time = event_time
+        self.received = received
+        self.skew = skew
+        self.frames = frames
+        # Header metadata per frame, filled in once the frames are final
+        self.frames_info: list[ImageInfo] = []
+        # The last frame was salvaged from an interrupted upload
+        self.partial = partial
+        # Replayed from a capture archive: drives the entities only, and
+        # never reaches the bus, the history or the snapshot store
+        self.replayed = replayed
+        # Frame budget held by the request, released once applied
+        self.reservation: FrameReservation | None = None
+
+    @property
+    def sort_key(self) -> datetime:
+        """Return the time events are ordered and compared by.
+
+        This is the camera's own clock, uncorrected: the skew estimate
+        moves as samples arrive, so corrected times of successive events
+        can run backwards. Undated events use their receipt time moved
+        onto the camera's clock by the skew known when they arrived.
+        The corrected ``event_time`` is for display and history only.
+        """
+        if self.device_time is not None:
+            return self.device_time
+        return self.received + timedelta(seconds=self.skew or 0)
+
+
 class VigiCameraBinarySensor(BinarySensorEntity):
     """Representation of a VIGI camera binary sensor."""
 
@@ -161,6 +323,17 @@ class VigiCameraBinarySensor(BinarySensorEntity):
         self._attr_is_on = False
         self._attributes: dict[str, Any] = {}
         self._reset_task: asyncio.Task[None] | None = None
+        # Per-camera event ordering: requests still being read, parsed
+        # events waiting to be applied, and the newest applied event time
+        self._in_flight: set[asyncio.Future[None]] = set()
+        self._pending_events: list[tuple[datetime, int, VigiEvent]] = []
+        self._event_seq = itertools.count()
+        self._apply_lock = asyncio.Lock()
+        self._last_event_key: datetime | None = None
+        # Snapshot pull for the newest JSON-only event, applied when it lands
+        self._pull_task: asyncio.Task[None] | None = None
+        # Sampled logging for the webhook path
+        self._log = IngestLog(_LOGGER, self._attr_name)
 
     @property
     def is_on(self) -> bool:
@@ -185,238 +358,827 @@ class VigiCameraBinarySensor(BinarySensorEntity):
             sw_version=self._attributes.get("firmware_version", "Unknown"),
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Write the webhook log summary on the shared activity sweep."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass, SIGNAL_ACTIVITY_SWEEP, self._async_flush_log
+            )
+        )
+
+    @callback
+    def _async_flush_log(self) -> None:
+        """Write the log summary if its window has elapsed."""
+        self._log.flush_if_due()
+
     async def handle_webhook(
         self,
         hass: HomeAssistant,
         webhook_id: str,
         request: Any,
-    ) -> None:
+    ) -> web.Response | None:
         """Handle incoming webhook data from camera."""
         try:
-            content_type = request.headers.get("Content-Type", "")
-            event_data: dict[str, Any] | None = None
-            image_bytes: bytes | None = None
-            image_content_type: str = "image/jpeg"
-
-            # Detect Content-Type and parse accordingly (FR-009, FR-010)
-            if "multipart/form-data" in content_type:
-                # Parse multipart form data
-                _LOGGER.debug(
-                    "Received multipart webhook for %s (camera_id: %s, webhook_id: %s)",
+            replayed: bool = getattr(request, "replayed", False)
+            camera_data = self._get_camera_data(hass)
+            gate: WebhookGate | None = camera_data["gate"] if camera_data else None
+
+            self._log.begin_webhook(request.content_length)
+
+            # Turn away oversized, mistyped, foreign or flooding requests
+            # before anything reads the body
+            if gate is not None and not replayed:
+                reason = gate.check(request)
+                if reason is not None:
+                    self._log.debug(
+                        "Rejected webhook for %s (camera_id: %s, source: %s): %s",
+                        self._attr_name,
+                        self._camera_id,
+                        request.remote,
+                        reason,
+                    )
+                    return web.Response(status=REJECT_STATUS[reason])
+
+            # Only requests the gate accepts show the camera is alive; a
+            # foreign sender or a flood must not keep it online
+            if camera_data is not None and not replayed:
+                camera_data["activity"].record()
+
+            # Capture mode: archive the raw request, then parse the buffered
+            # copy exactly like a live one. Replayed requests are not re-captured.
+            if not replayed:
+                capture: CaptureWriter | None = self._get_entry_helper(
+                    hass, CONF_CAPTURE
+                )
+                if capture is not None:
+                    body = await request.read()
+                    capture.async_record(
+                        self._camera_id,
+                        webhook_id,
+                        request.remote,
+                        request.headers.items(),
+                        body,
+                    )
+                    request = BufferedRequest(request.headers, body, request.remote)
+
+            # Announce this request as in flight so a concurrent, faster
+            # request for the same camera can wait for it before applying
+            in_flight: asyncio.Future[None] = hass.loop.create_future()
+            self._in_flight.add(in_flight)
+            event: VigiEvent | None = None
+            # Frames are charged to the camera's budget until applied
+            reservation = (
+                FrameReservation(camera_data["frame_budget"])
+                if camera_data is not None
+                else None
+            )
+            try:
+                event_data, frames, partial = await self._async_read_payload(
+                    hass, webhook_id, request, reservation
+                )
+                event = self._build_event(
+                    event_data, frames, partial, camera_data, replayed
+                )
+                if event is not None:
+                    event.frames, event.frames_info = self._inspect_frames(
+                        event.frames, event.partial
+                    )
+                    self._log.add_images(len(event.frames))
+                    heapq.heappush(
+                        self._pending_events,
+                        (event.sort_key, next(self._event_seq), event),
+                    )
+                    event.reservation = reservation
+                    reservation = None
+            finally:
+                self._in_flight.discard(in_flight)
+                in_flight.set_result(None)
+                if reservation is not None:
+                    reservation.release()
+
+            if event is None:
+                return None
+
+            await self._async_drain_events(hass)
+
+            # JSON-only event: the sensor is already on; the camera's
+            # snapshot is fetched afterwards and shown when it arrives
+            if (
+                not event.frames
+                and not replayed
+                and self._last_event_key == event.sort_key
+                and camera_data is not None
+                and camera_data.get(CONF_SNAPSHOT_URL)
+            ):
+                if self._pull_task is not None and not self._pull_task.done():
+                    self._pull_task.cancel()
+                self._pull_task = asyncio.create_task(
+                    self._async_attach_pulled_snapshot(hass, event)
+                )
+
+            # A valid event pins the address the camera reports for itself
+            if gate is not None and not replayed:
+                gate.learn_source(request.remote, event.ip)
+
+        except KeyError as e:
+            # Missing required field in webhook data
+            self._log.warning(
+                "Missing required field '%s' in webhook data for camera %s "
+                "(camera_id: %s, webhook_id: %s). Motion event cannot be processed.",
+                str(e),
+                self._attr_name,
+                self._camera_id,
+                webhook_id,
+            )
+        except Exception as e:
+            # Unexpected error - log with full context
+            self._log.errors += 1
+            _LOGGER.error(
+                "Unexpected error processing webhook for camera %s "
+                "(camera_id: %s, webhook_id: %s): %s",
+                self._attr_name,
+                self._camera_id,
+                webhook_id,
+                str(e),
+                exc_info=True,
+            )
+
+        return None
+
+    async def _async_read_payload(
+        self,
+        hass: HomeAssistant,
+        webhook_id: str,
+        request: Any,
+        reservation: FrameReservation | None = None,
+    ) -> tuple[dict[str, Any] | None, list[tuple[bytes, str]], bool]:
+        """Read and parse the request body.
+
+        Image bytes are taken from ``reservation`` as they are read;
+        frames that no longer fit the camera's budget are dropped.
+
+        Returns:
+            The event JSON (None if missing or malformed), every image
+            part of the request in arrival order, and whether the last
+            image is a partial one salvaged from an interrupted upload.
+        """
+        content_type = request.headers.get("Content-Type", "")
+        event_data: dict[str, Any] | None = None
+        image_bytes: bytes | None = None
+        image_content_type: str = "image/jpeg"
+        # Every image part of the request, in arrival order
+        frames: list[tuple[bytes, str]] = []
+        frames_size = 0
+        partial = False
+        camera_data = self._get_camera_data(hass)
+        uploads: UploadStats = (
+            camera_data["uploads"] if camera_data else UploadStats()
+        )
+        ingest: IngestWorker | None = self._get_entry_helper(
+            hass, CONF_ISOLATED_INGEST
+        )
+
+        if ingest is not None:
+            # Isolated ingest: only the body read stays on the event loop
+            try:
+                body = await request.read()
+            except asyncio.TimeoutError:
+                # FR-021: Network interruption while buffering the request
+                uploads.started += 1
+                uploads.lost += 1
+                self._log.warning(
+                    "Network timeout while receiving webhook body for camera %s "
+                    "(camera_id: %s, webhook_id: %s). Event cannot be processed.",
+                    self._attr_name,
+                    self._camera_id,
+                    webhook_id,
+                )
+                return None, [], False
+            parsed = await ingest.async_parse(content_type, body)
+            for error in parsed.errors:
+                # FR-022: Malformed payload
+                self._log.warning(
+                    "%s for camera %s (camera_id: %s, webhook_id: %s)",
+                    error,
                     self._attr_name,
                     self._camera_id,
                     webhook_id,
                 )
+            event_data = parsed.event_data
+            for image_bytes, image_content_type in parsed.images:
+                if reservation is not None and not reservation.take(len(image_bytes)):
+                    self._log.warning(
+                        "Dropped %d byte image for camera %s (camera_id: %s): "
+                        "camera frame budget of %d bytes exhausted",
+                        len(image_bytes),
+                        self._attr_name,
+                        self._camera_id,
+                        MAX_CAMERA_FRAME_BYTES,
+                    )
+                    continue
+                frames.append((image_bytes, image_content_type))
+            # The body was read in full before parsing
+            uploads.started += len(frames)
+            uploads.complete += len(frames)
 
-                try:
-                    reader = await request.multipart()
-
-                    async for part in reader:
-                        part_name = part.name
-
-                        # Check if this is the event data part (JSON)
-                        # Camera sends field named "event" for JSON data
-                        if part_name == "event":
-                            # Extract JSON metadata
-                            try:
-                                part_bytes = await part.read()
-                                # Decode bytearray to string and parse JSON
-                                event_data = await part.json() if hasattr(part, 'json') else None
-                                if event_data is None:
-                                    import json
-                                    event_data = json.loads(part_bytes.decode('utf-8'))
-
-                                _LOGGER.debug(
-                                    "Extracted JSON data from multipart field '%s' for %s",
-                                    part_name,
-                                    self._attr_name,
-                                )
-                            except (ValueError, UnicodeDecodeError) as e:
-                                # FR-022: Malformed JSON in event part
-                                _LOGGER.warning(
-                                    "Malformed JSON in multipart 'event' part for camera %s "
-                                    "(camera_id: %s): %s. Cannot process event.",
-                                    self._attr_name,
-                                    self._camera_id,
-                                    str(e),
-                                )
-                        else:
-                            # Any other field is treated as image data
-                            # Camera sends field named with datetime (e.g., "20251123180936")
-                            try:
-                                image_bytes = await part.read()
-                                image_content_type = part.headers.get("Content-Type", "image/jpeg")
-
-                                # FR-023: Warn if image size exceeds 5MB
-                                if len(image_bytes) > 5 * 1024 * 1024:
-                                    _LOGGER.warning(
-                                        "Image size (%d bytes) exceeds recommended limit (5MB) "
-                                        "for camera %s (camera_id: %s). Processing may be slower.",
-                                        len(image_bytes),
-                                        self._attr_name,
-                                        self._camera_id,
-                                    )
-
-                                _LOGGER.debug(
-                                    "Extracted image from multipart field '%s' for %s: %d bytes (%s)",
-                                    part_name,
-                                    self._attr_name,
-                                    len(image_bytes),
-                                    image_content_type,
-                                )
-                            except asyncio.TimeoutError:
-                                # FR-021: Network interruption during image transmission
-                                _LOGGER.warning(
+        # Detect Content-Type and parse accordingly (FR-009, FR-010)
+        elif "multipart/form-data" in content_type:
+            # Parse multipart form data
+            self._log.debug(
+                "Received multipart webhook for %s (camera_id: %s, webhook_id: %s)",
+                self._attr_name,
+                self._camera_id,
+                webhook_id,
+            )
+
+            try:
+                reader = await request.multipart()
+
+                async for part in reader:
+                    part_name = part.name
+
+                    # Check if this is the event data part (JSON)
+                    # Camera sends field named "event" for JSON data
+                    if part_name == "event":
+                        # Extract JSON metadata
+                        try:
+                            part_bytes = await part.read()
+                            # Decode bytearray to string and parse JSON
+                            event_data = await part.json() if hasattr(part, 'json') else None
+                            if event_data is None:
+                                import json
+                                event_data = json.loads(part_bytes.decode('utf-8'))
+
+                            self._log.debug(
+                                "Extracted JSON data from multipart field '%s' for %s",
+                                part_name,
+                                self._attr_name,
+                            )
+                        except (ValueError, UnicodeDecodeError) as e:
+                            # FR-022: Malformed JSON in event part
+                            self._log.warning(
+                                "Malformed JSON in multipart 'event' part for camera %s "
+                                "(camera_id: %s): %s. Cannot process event.",
+                                self._attr_name,
+                                self._camera_id,
+                                str(e),
+                            )
+                    else:
+                        # Any other field is treated as image data
+                        # Camera sends field named with datetime (e.g., "20251123180936")
+                        if len(frames) >= MAX_EVENT_FRAMES:
+                            # Unread parts are discarded by the reader
+                            self._log.debug(
+                                "Frame limit (%d) reached for %s, skipping field '%s'",
+                                MAX_EVENT_FRAMES,
+                                self._attr_name,
+                                part_name,
+                            )
+                            continue
+
+                        # Stop reading once the part outgrows what is left of
+                        # the event's or the camera's frame budget; the
+                        # reader skips the rest
+                        budget = MAX_EVENT_FRAME_BYTES - frames_size
+                        image_bytes, complete = await read_part_salvaging(
+                            part, budget, reservation
+                        )
+                        if image_bytes is None:
+                            self._log.warning(
+                                "Dropped image from field '%s' for camera %s "
+                                "(camera_id: %s): frame budget exhausted "
+                                "(%d bytes per event, %d per camera)",
+                                part_name,
+                                self._attr_name,
+                                self._camera_id,
+                                MAX_EVENT_FRAME_BYTES,
+                                MAX_CAMERA_FRAME_BYTES,
+                            )
+                            continue
+                        uploads.started += 1
+                        image_content_type = part.headers.get("Content-Type", "image/jpeg")
+
+                        if not complete:
+                            # FR-021: Network interruption during image transmission.
+                            # Keep the received prefix if it still decodes.
+                            salvaged = salvage_jpeg(image_bytes)
+                            if salvaged is None:
+                                uploads.lost += 1
+                                if reservation is not None:
+                                    reservation.release(len(image_bytes))
+                                self._log.warning(
                                     "Network timeout while receiving image for camera %s "
-                                    "(camera_id: %s, webhook_id: %s). "
-                                    "Motion event will be processed without image.",
+                                    "(camera_id: %s, webhook_id: %s) after %d bytes. "
+                                    "Motion event will be processed without it.",
                                     self._attr_name,
                                     self._camera_id,
                                     webhook_id,
+                                    len(image_bytes),
                                 )
+                                break
+                            uploads.salvaged += 1
+                            partial = True
+                            image_bytes = salvaged
+                            self._log.warning(
+                                "Network timeout while receiving image for camera %s "
+                                "(camera_id: %s, webhook_id: %s). "
+                                "Kept %d bytes as a partial image.",
+                                self._attr_name,
+                                self._camera_id,
+                                webhook_id,
+                                len(image_bytes),
+                            )
+                        else:
+                            uploads.complete += 1
 
-                except ValueError as e:
-                    # FR-022: Malformed multipart structure
-                    _LOGGER.warning(
-                        "Malformed multipart data for camera %s (camera_id: %s, webhook_id: %s): %s. "
-                        "Attempting to process available parts.",
-                        self._attr_name,
-                        self._camera_id,
-                        webhook_id,
-                        str(e),
-                    )
+                        frames.append((image_bytes, image_content_type))
+                        frames_size += len(image_bytes)
+
+                        # FR-023: Warn if image size exceeds 5MB
+                        if len(image_bytes) > 5 * 1024 * 1024:
+                            self._log.warning(
+                                "Image size (%d bytes) exceeds recommended limit (5MB) "
+                                "for camera %s (camera_id: %s). Processing may be slower.",
+                                len(image_bytes),
+                                self._attr_name,
+                                self._camera_id,
+                            )
+
+                        self._log.debug(
+                            "Extracted image from multipart field '%s' for %s: %d bytes (%s)",
+                            part_name,
+                            self._attr_name,
+                            len(image_bytes),
+                            image_content_type,
+                        )
+
+                        # The rest of the body will not arrive after a timeout
+                        if not complete:
+                            break
+
+            except ValueError as e:
+                # FR-022: Malformed multipart structure
+                self._log.warning(
+                    "Malformed multipart data for camera %s (camera_id: %s, webhook_id: %s): %s. "
+                    "Attempting to process available parts.",
+                    self._attr_name,
+                    self._camera_id,
+                    webhook_id,
+                    str(e),
+                )
+            except asyncio.TimeoutError:
+                # FR-021: Network interruption between or before image parts.
+                # Keep the event data and frames parsed so far.
+                uploads.cut_off += 1
+                self._log.warning(
+                    "Network timeout while receiving webhook for camera %s "
+                    "(camera_id: %s, webhook_id: %s). Processing what arrived: "
+                    "event data %s, %d image(s).",
+                    self._attr_name,
+                    self._camera_id,
+                    webhook_id,
+                    "received" if event_data is not None else "missing",
+                    len(frames),
+                )
 
+        else:
+            # Parse JSON body (no image)
+            try:
+                event_data = await request.json()
+                self._log.debug(
+                    "Received JSON webhook for %s (camera_id: %s, webhook_id: %s)",
+                    self._attr_name,
+                    self._camera_id,
+                    webhook_id,
+                )
+            except ValueError as e:
+                # FR-022: Malformed JSON body
+                self._log.warning(
+                    "Malformed JSON in webhook body for camera %s (camera_id: %s): %s. "
+                    "Cannot process event.",
+                    self._attr_name,
+                    self._camera_id,
+                    str(e),
+                )
+
+        return event_data, frames, partial
+
+    def _build_event(
+        self,
+        event_data: dict[str, Any] | None,
+        frames: list[tuple[bytes, str]],
+        partial: bool,
+        camera_data: dict[str, Any] | None,
+        replayed: bool = False,
+    ) -> VigiEvent | None:
+        """Turn parsed webhook data into an event, or None if there is none."""
+        # Process event data if available
+        if not event_data:
+            self._log.warning(
+                "No event data found in webhook for %s. Cannot process.",
+                self._attr_name,
+            )
+            return None
+
+        event_list: list[dict[str, Any]] = event_data.get("event_list", [])
+        if not event_list:
+            return None
+
+        latest_event = event_list[0]
+        date_time_str: str = latest_event.get("dateTime", "")
+
+        # Parse event time and correct it for the camera's clock skew
+        received = dt_util.now()
+        device_time: datetime | None = None
+        event_time: datetime | None = None
+        skew: ClockSkewEstimator | None = camera_data["skew"] if camera_data else None
+        if date_time_str:
+            device_time = parse_vigi_datetime(date_time_str)
+            if device_time is None:
+                self._log.warning(
+                    "Could not parse datetime '%s' for %s",
+                    date_time_str,
+                    self._attr_name,
+                )
             else:
-                # Parse JSON body (no image)
-                try:
-                    event_data = await request.json()
-                    _LOGGER.debug(
-                        "Received JSON webhook for %s (camera_id: %s, webhook_id: %s)",
-                        self._attr_name,
-                        self._camera_id,
-                        webhook_id,
-                    )
-                except ValueError as e:
-                    # FR-022: Malformed JSON body
-                    _LOGGER.warning(
-                        "Malformed JSON in webhook body for camera %s (camera_id: %s): %s. "
-                        "Cannot process event.",
+                device_time = dt_util.as_local(device_time)
+                event_time = device_time
+                if skew is not None:
+                    # A replayed request is received long after the camera
+                    # sent it; its delay says nothing about the clock
+                    if not replayed:
+                        skew.add_sample(device_time, received)
+                    event_time = skew.correct(device_time)
+
+        return VigiEvent(
+            device_name=event_data.get("device_name", "Unknown"),
+            ip=event_data.get("ip", "Unknown"),
+            mac=event_data.get("mac", "Unknown"),
+            event_types=latest_event.get("event_type", []),
+            device_time=device_time,
+            event_time=event_time,
+            received=received,
+            skew=skew.skew if skew is not None else None,
+            frames=frames,
+            partial=partial,
+            replayed=replayed,
+        )
+
+    def _inspect_frames(
+        self, frames: list[tuple[bytes, str]], partial: bool = False
+    ) -> tuple[list[tuple[bytes, str]], list[ImageInfo]]:
+        """Check each frame's headers before it is stored.
+
+        Only frames whose signature is JPEG, PNG, GIF or WebP are kept,
+        whatever type the part declared, and content types are taken
+        from the signature. A truncated frame is held to the same bar as
+        an interrupted upload: a JPEG is kept only if it salvages to a
+        partial picture, anything else is dropped.
+
+        Args:
+            frames: (image bytes, declared content type) pairs
+            partial: The last frame was salvaged from an interrupted upload
+
+        Returns:
+            The kept frames and their header metadata.
+        """
+        kept: list[tuple[bytes, str]] = []
+        infos: list[ImageInfo] = []
+        for index, (image_bytes, content_type) in enumerate(frames):
+            info = scan_image(image_bytes)
+            if info is None:
+                self._log.warning(
+                    "Dropped %d byte frame declared as %s for camera %s "
+                    "(camera_id: %s): not a JPEG, PNG, GIF or WebP image",
+                    len(image_bytes),
+                    content_type,
+                    self._attr_name,
+                    self._camera_id,
+                )
+                continue
+            if info.content_type != content_type:
+                self._log.debug(
+                    "Corrected content type of %d byte frame for %s from %s to %s",
+                    len(image_bytes),
+                    self._attr_name,
+                    content_type,
+                    info.content_type,
+                )
+            if partial and index == len(frames) - 1:
+                # Salvaged and already reported; the EOI marker it ends in
+                # was added on salvage, so the headers look complete
+                info.truncated = True
+            elif info.truncated:
+                # Cut short although the upload completed
+                salvaged = salvage_jpeg(image_bytes) if info.format == "jpeg" else None
+                if salvaged is None:
+                    self._log.warning(
+                        "Dropped truncated %s frame (%d bytes) for camera %s "
+                        "(camera_id: %s): too little arrived to display",
+                        info.format,
+                        len(image_bytes),
                         self._attr_name,
                         self._camera_id,
-                        str(e),
                     )
+                    continue
+                self._log.warning(
+                    "Truncated %s frame (%d bytes) for camera %s (camera_id: %s) "
+                    "kept as a partial image",
+                    info.format,
+                    len(image_bytes),
+                    self._attr_name,
+                    self._camera_id,
+                )
+                image_bytes = salvaged
+            kept.append((image_bytes, info.content_type))
+            infos.append(info)
+        return kept, infos
+
+    async def _async_pull_snapshot(
+        self, hass: HomeAssistant, camera_data: dict[str, Any] | None
+    ) -> list[tuple[bytes, str]]:
+        """Fetch a snapshot for a JSON-only event from the camera's snapshot URL.
 
-            # Process event data if available
-            if not event_data:
-                _LOGGER.warning(
-                    "No event data found in webhook for %s. Cannot process.",
+        Returns:
+            The pulled image as a single frame, or no frames if the camera
+            has no snapshot URL or the fetch failed.
+        """
+        url: str = camera_data.get(CONF_SNAPSHOT_URL, "") if camera_data else ""
+        puller: SnapshotPuller | None = hass.data.get(DATA_PULLER)
+        if not url or puller is None:
+            return []
+
+        pulled = await puller.async_pull(self._camera_id, url)
+        if pulled is None:
+            return []
+        self._log.debug(
+            "Pulled %d byte snapshot for %s (%s)",
+            len(pulled[0]),
+            self._attr_name,
+            pulled[1],
+        )
+        return [pulled]
+
+    async def _async_attach_pulled_snapshot(
+        self, hass: HomeAssistant, event: VigiEvent
+    ) -> None:
+        """Pull a snapshot for an applied JSON-only event and show it.
+
+        The pulled frame is dropped if a newer event has taken over the
+        live state while the fetch was running.
+        """
+        frames = await self._async_pull_snapshot(hass, self._get_camera_data(hass))
+        frames, frames_info = self._inspect_frames(frames)
+        if not frames:
+            return
+        self._log.add_images(len(frames))
+
+        async with self._apply_lock:
+            camera_data = self._get_camera_data(hass)
+            if camera_data is None or self._last_event_key != event.sort_key:
+                return
+            event.frames = frames
+            event.frames_info = frames_info
+            try:
+                await self._async_update_image(
+                    hass, camera_data, event, image_digest(frames[-1][0])
+                )
+            except Exception as e:  # noqa: BLE001
+                self._log.errors += 1
+                _LOGGER.error(
+                    "Unexpected error applying pulled snapshot for camera %s "
+                    "(camera_id: %s): %s",
                     self._attr_name,
+                    self._camera_id,
+                    str(e),
+                    exc_info=True,
                 )
                 return
+        async_dispatcher_send(hass, SIGNAL_CAMERA_EVENT.format(self._camera_id))
 
-            device_name: str = event_data.get("device_name", "Unknown")
-            ip: str = event_data.get("ip", "Unknown")
-            mac: str = event_data.get("mac", "Unknown")
-            event_list: list[dict[str, Any]] = event_data.get("event_list", [])
-
-            if event_list:
-                latest_event = event_list[0]
-                date_time_str: str = latest_event.get("dateTime", "")
-                event_types: list[str] = latest_event.get("event_type", [])
-
-                event_type_str = ", ".join(event_types) if event_types else "unknown"
-
-                # Turn on the binary sensor
-                self._attr_is_on = True
-
-                # Parse event time
-                event_time = None
-                if date_time_str:
-                    try:
-                        event_time = datetime.strptime(date_time_str, "%Y%m%d%H%M%S")
-                        event_time = dt_util.as_local(event_time)
-                    except ValueError:
-                        _LOGGER.warning(
-                            "Could not parse datetime '%s' for %s",
-                            date_time_str,
-                            self._attr_name,
-                        )
+    async def _async_drain_events(self, hass: HomeAssistant) -> None:
+        """Apply pending events for this camera in event-time order.
 
-                # Update attributes
-                self._attributes = {
-                    "device_name": device_name,
-                    "ip": ip,
-                    "mac": mac,
-                    "event_type": event_types,
-                    "event_type_string": event_type_str,
-                    "event_time": event_time.isoformat() if event_time else None,
-                    "last_triggered": dt_util.now().isoformat(),
-                }
+        Only one drain runs per camera at a time; other cameras are not
+        affected. Before draining, slower uploads already in flight get up
+        to EVENT_REORDER_WINDOW seconds to land so they can be ordered.
+        """
+        async with self._apply_lock:
+            others = {future for future in self._in_flight if not future.done()}
+            if others:
+                await asyncio.wait(others, timeout=EVENT_REORDER_WINDOW)
 
-                # Update stored camera data
+            while self._pending_events:
+                _, _, event = heapq.heappop(self._pending_events)
                 try:
-                    camera_data = hass.data[DOMAIN][self._entry.entry_id]["cameras"][self._camera_id]
-                    camera_data["is_on"] = True
-                    camera_data["last_event"] = event_types
-                    camera_data["last_event_time"] = event_time
-
-                    # Store image data if received
-                    if image_bytes:
-                        camera_data["last_image"] = image_bytes
-                        camera_data["last_image_time"] = dt_util.now()
-                        camera_data["last_image_size"] = len(image_bytes)
-
-                        # Update image entity if it exists
-                        self._update_image_entity(hass, image_bytes, image_content_type)
-
-                except KeyError:
-                    _LOGGER.warning(
-                        "Camera data not found for %s (camera_id: %s). "
-                        "Webhook may be outdated after configuration change.",
+                    await self._async_apply_event(hass, event)
+                except Exception as e:  # noqa: BLE001
+                    self._log.errors += 1
+                    _LOGGER.error(
+                        "Unexpected error applying event for camera %s "
+                        "(camera_id: %s): %s",
                         self._attr_name,
                         self._camera_id,
+                        str(e),
+                        exc_info=True,
                     )
+                finally:
+                    if event.reservation is not None:
+                        event.reservation.release()
+                        event.reservation = None
 
-                # Update entity state in Home Assistant
-                self.async_write_ha_state()
+    async def _async_apply_event(self, hass: HomeAssistant, event: VigiEvent) -> None:
+        """Record an event and, unless it is stale, update live state.
 
-                _LOGGER.info(
-                    "Event detected on %s: %s at %s%s",
-                    self._attr_name,
-                    event_type_str,
-                    event_time,
-                    " (with image)" if image_bytes else "",
-                )
+        Replayed events update live state but are not recorded.
+        """
+        event_types = event.event_types
+        event_time = event.event_time
+        frames = event.frames
+        image_bytes, image_content_type = frames[-1] if frames else (None, "image/jpeg")
+        event_type_str = ", ".join(event_types) if event_types else "unknown"
 
-                # Cancel any existing reset task
-                if self._reset_task and not self._reset_task.done():
-                    self._reset_task.cancel()
+        # Digest the snapshot once; dedup and history both key on it
+        digest = image_digest(image_bytes) if image_bytes else None
 
-                # Schedule reset to off after delay
-                self._reset_task = asyncio.create_task(self._reset_to_off())
+        # An event older than the last applied one (a slow upload that lost
+        # the race) still goes to history but must not roll back live state
+        stale = (
+            self._last_event_key is not None and event.sort_key < self._last_event_key
+        )
 
-        except KeyError as e:
-            # Missing required field in webhook data
-            _LOGGER.warning(
-                "Missing required field '%s' in webhook data for camera %s "
-                "(camera_id: %s, webhook_id: %s). Motion event cannot be processed.",
-                str(e),
+        # Append to the indexed event history
+        history: EventHistory | None = hass.data.get(DATA_HISTORY)
+        if history is not None and not event.replayed:
+            history.async_append(
+                self._camera_id,
+                event_time,
+                event_types,
+                digest.hex() if digest is not None else None,
+            )
+
+        camera_data = self._get_camera_data(hass)
+
+        # Announce the detection on the bus for automations
+        dispatcher: EventDispatcher | None = hass.data.get(DATA_DISPATCHER)
+        if dispatcher is not None and not event.replayed:
+            dispatcher.async_dispatch(
+                {
+                    "camera_id": self._camera_id,
+                    "camera_name": self._camera_name,
+                    "device_name": event.device_name,
+                    "event_type": event_types,
+                    "event_time": event_time.isoformat() if event_time else None,
+                    "snapshot": digest.hex() if digest is not None else None,
+                },
+                camera_data.get(CONF_EVENT_BATCH_WINDOW, 0) if camera_data else 0,
+            )
+
+        if stale:
+            self._log.debug(
+                "Stale event on %s (%s at %s, newest is %s); history only",
+                self._attr_name,
+                event_type_str,
+                event.sort_key,
+                self._last_event_key,
+            )
+            return
+        self._last_event_key = event.sort_key
+
+        # Turn on the binary sensor
+        self._attr_is_on = True
+
+        # Update attributes
+        self._attributes = {
+            "device_name": event.device_name,
+            "ip": event.ip,
+            "mac": event.mac,
+            "event_type": event_types,
+            "event_type_string": event_type_str,
+            "event_time": event_time.isoformat() if event_time else None,
+            "device_time": event.device_time.isoformat() if event.device_time else None,
+            "clock_skew": event.skew,
+            "last_triggered": event.received.isoformat(),
+        }
+
+        # Update stored camera data
+        if camera_data is None:
+            self._log.warning(
+                "Camera data not found for %s (camera_id: %s). "
+                "Webhook may be outdated after configuration change.",
                 self._attr_name,
                 self._camera_id,
-                webhook_id,
             )
-        except Exception as e:
-            # Unexpected error - log with full context
-            _LOGGER.error(
-                "Unexpected error processing webhook for camera %s "
-                "(camera_id: %s, webhook_id: %s): %s",
+        else:
+            camera_data["is_on"] = True
+            camera_data["last_event"] = event_types
+            camera_data["last_event_time"] = event_time
+
+            # Store image data if received
+            if image_bytes and digest is not None:
+                await self._async_update_image(hass, camera_data, event, digest)
+
+        # Update entity state in Home Assistant
+        self.async_write_ha_state()
+        async_dispatcher_send(hass, SIGNAL_CAMERA_EVENT.format(self._camera_id))
+
+        self._log.event(
+            "Event detected on %s: %s at %s (%d image(s)%s)",
+            self._attr_name,
+            event_type_str,
+            event_time,
+            len(frames),
+            ", last partial" if event.partial else "",
+        )
+
+        # Cancel any existing reset task
+        if self._reset_task and not self._reset_task.done():
+            self._reset_task.cancel()
+
+        # Schedule reset to off after delay
+        self._reset_task = asyncio.create_task(self._reset_to_off())
+
+    async def _async_update_image(
+        self,
+        hass: HomeAssistant,
+        camera_data: dict[str, Any],
+        event: VigiEvent,
+        digest: bytes,
+    ) -> None:
+        """Make the event's last frame the camera's current snapshot.
+
+        Repeats of the last snapshot skip the store and the image entity
+        refresh.
+        """
+        frames = event.frames
+        image_bytes, image_content_type = frames[-1]
+        dedup: SnapshotDeduplicator = camera_data["dedup"]
+        if await dedup.async_is_duplicate(hass, digest, image_bytes):
+            self._log.debug(
+                "Skipped duplicate snapshot for %s (%d bytes)",
                 self._attr_name,
+                len(image_bytes),
+            )
+            return
+
+        camera_data["last_image"] = image_bytes
+        camera_data["last_image_time"] = dt_util.now()
+        camera_data["last_image_size"] = len(image_bytes)
+        camera_data["last_image_digest"] = digest
+        camera_data["last_image_content_type"] = image_content_type
+        camera_data["last_frames"] = frames
+        camera_data["last_frames_info"] = event.frames_info
+        camera_data["last_image_info"] = (
+            event.frames_info[-1].as_dict() if event.frames_info else None
+        )
+        camera_data["last_image_partial"] = event.partial
+
+        # Feed live MJPEG viewers, oldest frame first
+        broadcaster: FrameBroadcaster = camera_data["broadcaster"]
+        for frame, frame_type in frames:
+            broadcaster.publish(frame, frame_type)
+
+        # Update image entity if it exists
+        self._update_image_entity(hass, image_bytes, image_content_type)
+
+        # Keep the snapshot for the media browser
+        store: SnapshotStore | None = hass.data.get(DATA_SNAPSHOTS)
+        if (
+            store is not None
+            and camera_data.get(CONF_STORE_SNAPSHOTS)
+            and not event.replayed
+        ):
+            await store.async_save(
                 self._camera_id,
-                webhook_id,
-                str(e),
-                exc_info=True,
+                event.event_time or event.received,
+                digest,
+                image_bytes,
+                image_content_type,
             )
 
+    def _get_camera_data(self, hass: HomeAssistant) -> dict[str, Any] | None:
+        """Return this camera's runtime data, or None if it was removed."""
+        entry_data = hass.data[DOMAIN].get(self._entry.entry_id)
+        if not entry_data:
+            return None
+        camera_data: dict[str, Any] | None = entry_data["cameras"].get(self._camera_id)
+        return camera_data
+
+    def _get_entry_helper(self, hass: HomeAssistant, key: str) -> Any:
+        """Return the entry-wide helper stored under ``key``.
+
+        Helpers such as the capture writer and ingest worker are shared by
+        all cameras of an entry but enabled per camera; None is returned
+        when this camera has the feature switched off.
+        """
+        entry_data = hass.data[DOMAIN].get(self._entry.entry_id)
+        if not entry_data:
+            return None
+        camera_data = entry_data["cameras"].get(self._camera_id)
+        if not camera_data or not camera_data.get(key):
+            return None
+        return entry_data.get(key)
+
     def _update_image_entity(
         self,
         hass: HomeAssistant,
@@ -426,7 +1188,7 @@ class VigiCameraBinarySensor(BinarySensorEntity):
         """Update the associated image entity with new image bytes."""
         # Store image data in hass.data so image entity can retrieve it
         # Image entity will read from camera_data["last_image"] in its async_image() method
-        _LOGGER.debug(
+        self._log.debug(
             "Stored %d bytes of image data for %s (accessible to image entity)",
             len(image_bytes),
             self._attr_name,
@@ -451,10 +1213,88 @@ class VigiCameraBinarySensor(BinarySensorEntity):
         # Cancel reset task if running
         if self._reset_task and not self._reset_task.done():
             self._reset_task.cancel()
+        if self._pull_task and not self._pull_task.done():
+            self._pull_task.cancel()
 
         # Clean up camera data
         entry_data = self._hass.data[DOMAIN].get(self._entry.entry_id)
         if entry_data and self._camera_id in entry_data.get("cameras", {}):
-            entry_data["cameras"].pop(self._camera_id, None)
+            camera_data = entry_data["cameras"].pop(self._camera_id)
+            camera_data["broadcaster"].close()
 
         _LOGGER.debug("Cleaned up entity %s", self._attr_name)
+
+
+class VigiLivenessBinarySensor(BinarySensorEntity):
+    """On while the camera keeps posting webhooks within its silence threshold."""
+
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_has_entity_name = False
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the binary sensor."""
+        self._hass = hass
+        self._entry = entry
+        self._camera_id = camera_id
+        self._camera_name = camera_name
+        self._attr_name = f"{camera_name} Online"
+        self._attr_unique_id = f"{entry.entry_id}_{camera_id}_online"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this camera."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._camera_id)},
+            name=self._camera_name,
+            manufacturer="TP-Link",
+            model="VIGI Camera",
+        )
+
+    def _get_tracker(self) -> ActivityTracker | None:
+        """Return this camera's activity tracker, or None if it was removed."""
+        entry_data = self._hass.data[DOMAIN].get(self._entry.entry_id)
+        if not entry_data:
+            return None
+        camera_data = entry_data["cameras"].get(self._camera_id)
+        if not camera_data:
+            return None
+        tracker: ActivityTracker = camera_data["activity"]
+        return tracker
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the camera posted within its silence threshold."""
+        tracker = self._get_tracker()
+        if tracker is None:
+            return None
+        return tracker.alive
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        tracker = self._get_tracker()
+        if tracker is None:
+            return {}
+        return {"silence_threshold": tracker.silence_threshold}
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh on every event and on the shared activity sweep."""
+        for signal in (
+            SIGNAL_CAMERA_EVENT.format(self._camera_id),
+            SIGNAL_ACTIVITY_SWEEP,
+        ):
+            self.async_on_remove(
+                async_dispatcher_connect(self._hass, signal, self._async_refresh)
+            )
+
+    @callback
+    def _async_refresh(self) -> None:
+        """Write the current liveness."""
+        self.async_write_ha_state()
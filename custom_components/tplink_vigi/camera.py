@@ -0,0 +1,152 @@
+"""Camera platform for TP-Link VIGI cameras.
+
+Serves an MJPEG stream assembled from the snapshots cameras push with
+their webhook events. All viewers share the camera's FrameBroadcaster.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from aiohttp import web
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    CONF_CAMERA_ID,
+    DOMAIN,
+    MJPEG_BOUNDARY,
+    MJPEG_FRAME_INTERVAL,
+    MJPEG_KEEPALIVE_INTERVAL,
+)
+from .stream import FrameBroadcaster
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up camera entities from config entry."""
+    cameras = entry.data.get("cameras", [])
+
+    entities: list[VigiCamera] = []
+
+    for camera in cameras:
+        camera_name: str = camera[CONF_NAME]
+        camera_id: str = camera.get(CONF_CAMERA_ID, "")
+
+        # Ensure camera_id exists (should be set by binary_sensor platform)
+        if not camera_id:
+            _LOGGER.warning(
+                "Camera '%s' missing camera_id. Camera entity not created.",
+                camera_name,
+            )
+            continue
+
+        entities.append(VigiCamera(hass, entry, camera_id, camera_name))
+
+    async_add_entities(entities)
+
+
+class VigiCamera(Camera):
+    """MJPEG stream of recent snapshots from a VIGI camera."""
+
+    _attr_has_entity_name: bool = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the camera entity."""
+        super().__init__()
+        self._hass = hass
+        self._entry = entry
+        self._camera_id = camera_id
+        self._camera_name = camera_name
+        self._attr_name = f"{camera_name} Live"
+        self._attr_unique_id = f"{entry.entry_id}_{camera_id}_live"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this camera."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._camera_id)},
+            name=self._camera_name,
+            manufacturer="TP-Link",
+            model="VIGI Camera",
+        )
+
+    def _get_broadcaster(self) -> FrameBroadcaster | None:
+        """Return the camera's shared broadcaster, if the camera is loaded."""
+        try:
+            broadcaster: FrameBroadcaster = self._hass.data[DOMAIN][
+                self._entry.entry_id
+            ]["cameras"][self._camera_id]["broadcaster"]
+        except KeyError:
+            return None
+        return broadcaster
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the most recent snapshot."""
+        try:
+            image: bytes | None = self._hass.data[DOMAIN][self._entry.entry_id][
+                "cameras"
+            ][self._camera_id]["last_image"]
+        except KeyError:
+            return None
+        return image
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Stream snapshots to one viewer as multipart MJPEG."""
+        broadcaster = self._get_broadcaster()
+        if broadcaster is None:
+            return None
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+                "Cache-Control": "no-cache",
+            }
+        )
+        await response.prepare(request)
+
+        broadcaster.viewers += 1
+        try:
+            # Start with the current frame so the viewer sees something at once
+            cursor, chunk = broadcaster.latest()
+            while not broadcaster.closed:
+                if chunk is not None:
+                    # Awaiting the write is the back-pressure: while a slow
+                    # viewer drains, the ring moves on and it skips frames
+                    await response.write(chunk)
+                    await asyncio.sleep(MJPEG_FRAME_INTERVAL)
+
+                next_cursor, chunk = await broadcaster.async_next(
+                    cursor, MJPEG_KEEPALIVE_INTERVAL
+                )
+                if chunk is None:
+                    # Idle: resend the current frame to keep the connection alive
+                    _, chunk = broadcaster.latest()
+                cursor = next_cursor
+        except ConnectionResetError:
+            pass
+        finally:
+            broadcaster.viewers -= 1
+
+        return response
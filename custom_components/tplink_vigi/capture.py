@@ -0,0 +1,274 @@
+"""Raw webhook capture and replay for TP-Link VIGI cameras.
+
+Capture mode records the headers and body of every webhook request for
+opted-in cameras into a rotating archive of gzip segments. Writes are
+batched and run in the executor so the event loop never touches the disk.
+The archive can be fed back through the webhook handlers with
+``async_replay`` to reproduce firmware-specific payloads.
+
+Segment layout (each record, repeated)::
+
+    4-byte big-endian meta length | meta JSON | 4-byte body length | body
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+import gzip
+import heapq
+import itertools
+import json
+import logging
+from pathlib import Path
+import struct
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CAPTURE_MAX_PENDING_BYTES,
+    CAPTURE_MAX_SEGMENTS,
+    CAPTURE_SEGMENT_MAX_BYTES,
+    CAPTURE_SEGMENT_SUFFIX,
+)
+from .payload import BufferedRequest
+
+_LOGGER = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+# Records loaded from disk per executor round-trip during replay
+_REPLAY_CHUNK = 64
+
+WebhookHandler = Callable[[HomeAssistant, str, Any], Awaitable[Any]]
+
+
+class CapturedRequest:
+    """A webhook request loaded from a capture archive."""
+
+    __slots__ = ("received", "camera_id", "webhook_id", "remote", "headers", "body")
+
+    def __init__(
+        self,
+        received: float,
+        camera_id: str,
+        webhook_id: str,
+        remote: str | None,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> None:
+        """Initialize the captured request."""
+        self.received = received
+        self.camera_id = camera_id
+        self.webhook_id = webhook_id
+        self.remote = remote
+        self.headers = headers
+        self.body = body
+
+    def to_request(self) -> BufferedRequest:
+        """Build a request object the webhook handler can consume."""
+        return BufferedRequest(self.headers, self.body, self.remote, replayed=True)
+
+
+class CaptureWriter:
+    """Batched, rotating on-disk writer for raw webhook traffic."""
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the writer.
+
+        Args:
+            hass: Home Assistant instance
+            directory: Directory that holds this writer's segments
+        """
+        self._hass = hass
+        self._directory = directory
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._flush_task: asyncio.Task[None] | None = None
+        self._segment: Path | None = None
+        self.dropped = 0
+
+    def async_record(
+        self,
+        camera_id: str,
+        webhook_id: str,
+        remote: str | None,
+        headers: Iterable[tuple[str, str]],
+        body: bytes,
+    ) -> None:
+        """Queue one request for writing.
+
+        Must be called from the event loop. Records are dropped (and
+        counted) while the backlog exceeds the pending byte limit so a
+        slow disk cannot grow memory without bound.
+        """
+        if self._pending_bytes + len(body) > CAPTURE_MAX_PENDING_BYTES:
+            self.dropped += 1
+            _LOGGER.debug(
+                "Capture backlog full, dropped request for camera_id %s", camera_id
+            )
+            return
+
+        meta = json.dumps(
+            {
+                "t": time.time(),
+                "camera_id": camera_id,
+                "webhook_id": webhook_id,
+                "remote": remote,
+                "headers": dict(headers),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        record = b"".join(
+            (_LENGTH.pack(len(meta)), meta, _LENGTH.pack(len(body)), body)
+        )
+        self._pending.append(record)
+        self._pending_bytes += len(record)
+
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_background_task(
+                self._async_flush(), "tplink_vigi capture flush"
+            )
+
+    async def _async_flush(self) -> None:
+        """Write queued records until the queue is empty."""
+        try:
+            while self._pending:
+                batch = self._pending
+                self._pending = []
+                self._pending_bytes = 0
+                await self._hass.async_add_executor_job(self._write_batch, batch)
+        except OSError as e:
+            _LOGGER.error(
+                "Failed to write webhook capture to %s: %s", self._directory, e
+            )
+        finally:
+            self._flush_task = None
+
+    def _write_batch(self, batch: list[bytes]) -> None:
+        """Append a batch of records to the current segment (executor)."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        if (
+            self._segment is None
+            or not self._segment.exists()
+            or self._segment.stat().st_size >= CAPTURE_SEGMENT_MAX_BYTES
+        ):
+            self._segment = self._directory / (
+                dt_util.utcnow().strftime("%Y%m%d%H%M%S%f") + CAPTURE_SEGMENT_SUFFIX
+            )
+            self._prune_segments()
+
+        # Each batch becomes its own gzip member; concatenated members
+        # read back as one continuous stream
+        with gzip.open(self._segment, "ab", compresslevel=5) as fp:
+            for record in batch:
+                fp.write(record)
+
+    def _prune_segments(self) -> None:
+        """Delete the oldest segments beyond the retention limit (executor)."""
+        segments = sorted(self._directory.glob(f"*{CAPTURE_SEGMENT_SUFFIX}"))
+        for old in segments[: max(0, len(segments) - CAPTURE_MAX_SEGMENTS + 1)]:
+            old.unlink(missing_ok=True)
+
+    async def async_close(self) -> None:
+        """Flush outstanding records."""
+        if self._flush_task is not None:
+            await self._flush_task
+
+
+def _iter_segment(segment: Path) -> Iterator[CapturedRequest]:
+    """Yield records from one segment, stopping at a truncated tail."""
+    try:
+        with gzip.open(segment, "rb") as fp:
+            while True:
+                header = fp.read(_LENGTH.size)
+                if len(header) < _LENGTH.size:
+                    return
+                meta = json.loads(fp.read(_LENGTH.unpack(header)[0]))
+                body_len = fp.read(_LENGTH.size)
+                if len(body_len) < _LENGTH.size:
+                    return
+                body = fp.read(_LENGTH.unpack(body_len)[0])
+                yield CapturedRequest(
+                    meta["t"],
+                    meta["camera_id"],
+                    meta["webhook_id"],
+                    meta.get("remote"),
+                    meta["headers"],
+                    body,
+                )
+    except (OSError, EOFError, ValueError, KeyError) as e:
+        _LOGGER.warning("Stopped reading capture segment %s: %s", segment, e)
+
+
+def iter_capture(root: Path) -> Iterator[CapturedRequest]:
+    """Yield every captured request below ``root`` in receipt order.
+
+    Each writer directory is already time ordered, so directories are
+    merged lazily instead of loading the whole archive. Nothing runs
+    until the first record is requested, so the directory walk happens
+    on whichever thread starts iterating (the executor during replay).
+    """
+    streams: dict[Path, list[Path]] = {}
+    for segment in sorted(root.rglob(f"*{CAPTURE_SEGMENT_SUFFIX}")):
+        streams.setdefault(segment.parent, []).append(segment)
+
+    yield from heapq.merge(
+        *(
+            itertools.chain.from_iterable(_iter_segment(s) for s in segments)
+            for segments in streams.values()
+        ),
+        key=lambda record: record.received,
+    )
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    root: Path,
+    handlers: dict[str, WebhookHandler],
+    speed: float = 1.0,
+) -> int:
+    """Feed a capture archive back through the webhook handlers.
+
+    Args:
+        hass: Home Assistant instance
+        root: Archive directory (searched recursively for segments)
+        handlers: Webhook handler per camera_id; other cameras are skipped
+        speed: Playback rate relative to the original timing; 0 replays
+            as fast as possible
+
+    Returns:
+        Number of requests replayed.
+    """
+    records = iter_capture(root)
+    replayed = 0
+    first: float | None = None
+    started = time.monotonic()
+
+    while True:
+        chunk: list[CapturedRequest] = await hass.async_add_executor_job(
+            list, itertools.islice(records, _REPLAY_CHUNK)
+        )
+        if not chunk:
+            break
+
+        for record in chunk:
+            handler = handlers.get(record.camera_id)
+            if handler is None:
+                continue
+
+            if first is None:
+                first = record.received
+            if speed > 0:
+                delay = (record.received - first) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await handler(hass, record.webhook_id, record.to_request())
+            replayed += 1
+
+    _LOGGER.info("Replayed %d captured webhook request(s) from %s", replayed, root)
+    return replayed
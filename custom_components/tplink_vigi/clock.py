@@ -0,0 +1,82 @@
+"""Event time handling for TP-Link VIGI cameras.
+
+VIGI cameras stamp events with a fixed 14-digit local time
+(``YYYYMMDDHHMMSS``) taken from their own clock, which can drift by
+minutes. This module parses that format without ``strptime`` and keeps
+a per-camera estimate of the drift so event times can be corrected.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+import statistics
+from typing import Any
+
+from .const import SKEW_CORRECTION_THRESHOLD, SKEW_MIN_SAMPLES, SKEW_WINDOW
+
+
+@lru_cache(maxsize=64)
+def parse_vigi_datetime(value: str) -> datetime | None:
+    """Parse a VIGI ``YYYYMMDDHHMMSS`` timestamp into a naive datetime.
+
+    Slicing fixed offsets avoids the locale and regex machinery behind
+    ``strptime``; bursts of events sharing one timestamp hit the cache.
+
+    Args:
+        value: 14-digit timestamp from the event's ``dateTime`` field
+
+    Returns:
+        The parsed datetime, or None if the value is malformed.
+    """
+    if len(value) != 14 or not value.isdigit():
+        return None
+    try:
+        return datetime(
+            int(value[0:4]),
+            int(value[4:6]),
+            int(value[6:8]),
+            int(value[8:10]),
+            int(value[10:12]),
+            int(value[12:14]),
+        )
+    except ValueError:
+        return None
+
+
+class ClockSkewEstimator:
+    """Rolling estimate of how far a camera's clock is off."""
+
+    def __init__(self) -> None:
+        """Initialize an empty estimator."""
+        # Device time minus receipt time, in seconds
+        self._samples: deque[float] = deque(maxlen=SKEW_WINDOW)
+        self.skew: float | None = None
+
+    def add_sample(self, device_time: datetime, received: datetime) -> None:
+        """Record one event's device time against its receipt time.
+
+        The median over the window discards outliers from delayed
+        deliveries and retried uploads.
+        """
+        self._samples.append((device_time - received).total_seconds())
+        if len(self._samples) >= SKEW_MIN_SAMPLES:
+            self.skew = statistics.median(self._samples)
+
+    def correct(self, device_time: datetime) -> datetime:
+        """Return ``device_time`` adjusted by the current skew estimate.
+
+        Skews below SKEW_CORRECTION_THRESHOLD are left alone; they are
+        within network and one-second timestamp resolution noise.
+        """
+        if self.skew is None or abs(self.skew) < SKEW_CORRECTION_THRESHOLD:
+            return device_time
+        return device_time - timedelta(seconds=self.skew)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return skew state for diagnostics."""
+        return {
+            "skew_seconds": self.skew,
+            "samples": len(self._samples),
+        }
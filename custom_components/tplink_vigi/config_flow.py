@@ -8,6 +8,7 @@ from typing import Any
 import uuid
 
 import voluptuous as vol
+from yarl import URL
 
 from homeassistant import config_entries
 from homeassistant.components.webhook import async_unregister as webhook_unregister
@@ -23,9 +24,33 @@ from .const import (
     CONF_CAMERA_ID,
     CONF_WEBHOOK_ID,
     CONF_RESET_DELAY,
+    CONF_CAPTURE,
+    CONF_ISOLATED_INGEST,
+    CONF_RATE_LIMIT,
+    CONF_RESTRICT_SOURCE,
+    CONF_PERCEPTUAL_DEDUP,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_STORE_SNAPSHOTS,
+    CONF_SNAPSHOT_URL,
+    CONF_SILENCE_THRESHOLD,
     DEFAULT_RESET_DELAY,
+    DEFAULT_CAPTURE,
+    DEFAULT_ISOLATED_INGEST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RESTRICT_SOURCE,
+    DEFAULT_PERCEPTUAL_DEDUP,
+    DEFAULT_EVENT_BATCH_WINDOW,
+    DEFAULT_STORE_SNAPSHOTS,
+    DEFAULT_SNAPSHOT_URL,
+    DEFAULT_SILENCE_THRESHOLD,
     MIN_RESET_DELAY,
     MAX_RESET_DELAY,
+    MIN_RATE_LIMIT,
+    MAX_RATE_LIMIT,
+    MIN_EVENT_BATCH_WINDOW,
+    MAX_EVENT_BATCH_WINDOW,
+    MIN_SILENCE_THRESHOLD,
+    MAX_SILENCE_THRESHOLD,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -51,6 +76,20 @@ def _validate_webhook_id(webhook_id: str) -> bool:
     return bool(WEBHOOK_ID_PATTERN.match(webhook_id))
 
 
+def _validate_snapshot_url(url: str) -> bool:
+    """Validate an optional snapshot URL.
+
+    Empty is allowed; otherwise it must be an absolute http(s) URL.
+    """
+    if not url:
+        return True
+    try:
+        parsed = URL(url)
+    except ValueError:
+        return False
+    return parsed.scheme in ("http", "https") and bool(parsed.host)
+
+
 def _get_base_url(hass: HomeAssistant) -> str:
     """Get base URL for webhook display."""
     try:
@@ -262,10 +301,39 @@ class VigiOptionsFlow(config_entries.OptionsFlow):
             if not (MIN_RESET_DELAY <= new_reset_delay <= MAX_RESET_DELAY):
                 errors[CONF_RESET_DELAY] = "invalid_reset_delay"
 
+            new_snapshot_url = user_input.get(CONF_SNAPSHOT_URL, DEFAULT_SNAPSHOT_URL).strip()
+            if not _validate_snapshot_url(new_snapshot_url):
+                errors[CONF_SNAPSHOT_URL] = "invalid_snapshot_url"
+
             if not errors:
                 # Update camera (preserve existing name, webhook_id, and camera_id)
                 # Webhook ID is read-only (FR-003)
                 cameras[self._camera_to_edit_idx][CONF_RESET_DELAY] = new_reset_delay
+                cameras[self._camera_to_edit_idx][CONF_CAPTURE] = user_input.get(
+                    CONF_CAPTURE, DEFAULT_CAPTURE
+                )
+                cameras[self._camera_to_edit_idx][CONF_ISOLATED_INGEST] = user_input.get(
+                    CONF_ISOLATED_INGEST, DEFAULT_ISOLATED_INGEST
+                )
+                cameras[self._camera_to_edit_idx][CONF_RATE_LIMIT] = user_input.get(
+                    CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT
+                )
+                cameras[self._camera_to_edit_idx][CONF_RESTRICT_SOURCE] = user_input.get(
+                    CONF_RESTRICT_SOURCE, DEFAULT_RESTRICT_SOURCE
+                )
+                cameras[self._camera_to_edit_idx][CONF_PERCEPTUAL_DEDUP] = user_input.get(
+                    CONF_PERCEPTUAL_DEDUP, DEFAULT_PERCEPTUAL_DEDUP
+                )
+                cameras[self._camera_to_edit_idx][CONF_EVENT_BATCH_WINDOW] = user_input.get(
+                    CONF_EVENT_BATCH_WINDOW, DEFAULT_EVENT_BATCH_WINDOW
+                )
+                cameras[self._camera_to_edit_idx][CONF_STORE_SNAPSHOTS] = user_input.get(
+                    CONF_STORE_SNAPSHOTS, DEFAULT_STORE_SNAPSHOTS
+                )
+                cameras[self._camera_to_edit_idx][CONF_SNAPSHOT_URL] = new_snapshot_url
+                cameras[self._camera_to_edit_idx][CONF_SILENCE_THRESHOLD] = user_input.get(
+                    CONF_SILENCE_THRESHOLD, DEFAULT_SILENCE_THRESHOLD
+                )
 
                 # Update config entry
                 self.hass.config_entries.async_update_entry(
@@ -299,6 +367,64 @@ class VigiOptionsFlow(config_entries.OptionsFlow):
                         "unit_of_measurement": "seconds",
                     }
                 }),
+                vol.Optional(
+                    CONF_CAPTURE,
+                    default=camera.get(CONF_CAPTURE, DEFAULT_CAPTURE)
+                ): selector({"boolean": {}}),
+                vol.Optional(
+                    CONF_ISOLATED_INGEST,
+                    default=camera.get(CONF_ISOLATED_INGEST, DEFAULT_ISOLATED_INGEST)
+                ): selector({"boolean": {}}),
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=camera.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)
+                ): selector({
+                    "number": {
+                        "min": MIN_RATE_LIMIT,
+                        "max": MAX_RATE_LIMIT,
+                        "mode": "box",
+                        "unit_of_measurement": "requests/s",
+                    }
+                }),
+                vol.Optional(
+                    CONF_RESTRICT_SOURCE,
+                    default=camera.get(CONF_RESTRICT_SOURCE, DEFAULT_RESTRICT_SOURCE)
+                ): selector({"boolean": {}}),
+                vol.Optional(
+                    CONF_PERCEPTUAL_DEDUP,
+                    default=camera.get(CONF_PERCEPTUAL_DEDUP, DEFAULT_PERCEPTUAL_DEDUP)
+                ): selector({"boolean": {}}),
+                vol.Optional(
+                    CONF_EVENT_BATCH_WINDOW,
+                    default=camera.get(CONF_EVENT_BATCH_WINDOW, DEFAULT_EVENT_BATCH_WINDOW)
+                ): selector({
+                    "number": {
+                        "min": MIN_EVENT_BATCH_WINDOW,
+                        "max": MAX_EVENT_BATCH_WINDOW,
+                        "step": 0.1,
+                        "mode": "box",
+                        "unit_of_measurement": "seconds",
+                    }
+                }),
+                vol.Optional(
+                    CONF_STORE_SNAPSHOTS,
+                    default=camera.get(CONF_STORE_SNAPSHOTS, DEFAULT_STORE_SNAPSHOTS)
+                ): selector({"boolean": {}}),
+                vol.Optional(
+                    CONF_SNAPSHOT_URL,
+                    default=camera.get(CONF_SNAPSHOT_URL, DEFAULT_SNAPSHOT_URL)
+                ): selector({"text": {"type": "url"}}),
+                vol.Optional(
+                    CONF_SILENCE_THRESHOLD,
+                    default=camera.get(CONF_SILENCE_THRESHOLD, DEFAULT_SILENCE_THRESHOLD)
+                ): selector({
+                    "number": {
+                        "min": MIN_SILENCE_THRESHOLD,
+                        "max": MAX_SILENCE_THRESHOLD,
+                        "mode": "box",
+                        "unit_of_measurement": "minutes",
+                    }
+                }),
             }),
             errors=errors,
             description_placeholders={
@@ -3,18 +3,157 @@
 # Domain
 DOMAIN = "tplink_vigi"
 
+# hass.data key for the integration-wide event history store
+DATA_HISTORY = f"{DOMAIN}_history"
+# hass.data key for the integration-wide bus event dispatcher
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+# hass.data key for the integration-wide snapshot store
+DATA_SNAPSHOTS = f"{DOMAIN}_snapshots"
+# hass.data key for the integration-wide snapshot puller
+DATA_PULLER = f"{DOMAIN}_puller"
+
 # Configuration
 CONF_CAMERAS = "cameras"
 CONF_CAMERA_ID = "camera_id"
 CONF_WEBHOOK_ID = "webhook_id"
 CONF_RESET_DELAY = "reset_delay"
+CONF_CAPTURE = "capture"
+CONF_ISOLATED_INGEST = "isolated_ingest"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RESTRICT_SOURCE = "restrict_source"
+CONF_PERCEPTUAL_DEDUP = "perceptual_dedup"
+CONF_EVENT_BATCH_WINDOW = "event_batch_window"
+CONF_STORE_SNAPSHOTS = "store_snapshots"
+CONF_SNAPSHOT_URL = "snapshot_url"
+CONF_SILENCE_THRESHOLD = "silence_threshold"
 
 # Default values
 DEFAULT_RESET_DELAY = 1
+DEFAULT_CAPTURE = False
+DEFAULT_ISOLATED_INGEST = False
+DEFAULT_RATE_LIMIT = 0
+DEFAULT_RESTRICT_SOURCE = False
+DEFAULT_PERCEPTUAL_DEDUP = False
+DEFAULT_EVENT_BATCH_WINDOW = 0
+DEFAULT_STORE_SNAPSHOTS = False
+DEFAULT_SNAPSHOT_URL = ""
+DEFAULT_SILENCE_THRESHOLD = 60
 
 # Validation limits
 MIN_RESET_DELAY = 1
 MAX_RESET_DELAY = 60
+MIN_RATE_LIMIT = 0
+MAX_RATE_LIMIT = 100
+MIN_EVENT_BATCH_WINDOW = 0
+MAX_EVENT_BATCH_WINDOW = 10
+MIN_SILENCE_THRESHOLD = 1
+MAX_SILENCE_THRESHOLD = 10080
+
+# Pre-parse request gate
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+RATE_LIMIT_BURST = 20
+# Seconds without traffic from a camera's pinned address before it lapses
+SOURCE_PIN_TTL = 600
+ACCEPTED_CONTENT_TYPES = (
+    "multipart/form-data",
+    "application/json",
+    "text/json",
+    "text/plain",
+)
+REJECT_TOO_LARGE = "too_large"
+REJECT_CONTENT_TYPE = "content_type"
+REJECT_SOURCE = "source"
+REJECT_RATE_LIMITED = "rate_limited"
+
+# Image parts retained per webhook request (the latest event's frames)
+MAX_EVENT_FRAMES = 10
+MAX_EVENT_FRAME_BYTES = 8 * 1024 * 1024
+# Image bytes one camera may hold across all requests not yet applied
+MAX_CAMERA_FRAME_BYTES = 2 * MAX_EVENT_FRAME_BYTES
+
+# Streaming image reads: chunk size, and the entropy-coded bytes a
+# truncated JPEG needs past its scan header to be kept as a partial image
+IMAGE_READ_CHUNK = 64 * 1024
+SALVAGE_MIN_SCAN_BYTES = 1024
+
+# MJPEG stream built from recent snapshots
+MJPEG_BOUNDARY = "vigiframe"
+MJPEG_BUFFER_FRAMES = 10
+MJPEG_FRAME_INTERVAL = 0.2
+MJPEG_KEEPALIVE_INTERVAL = 10
+
+# Snapshot deduplication: max differing bits between 64-bit dHashes
+PERCEPTUAL_HASH_MAX_DISTANCE = 4
+
+# Raw webhook capture archive (stored under <config>/tplink_vigi/capture)
+CAPTURE_DIR = "capture"
+CAPTURE_SEGMENT_SUFFIX = ".vcap.gz"
+CAPTURE_SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+CAPTURE_MAX_SEGMENTS = 8
+CAPTURE_MAX_PENDING_BYTES = 32 * 1024 * 1024
+
+# Event history store (<config>/tplink_vigi/events.db)
+HISTORY_FILE = "events.db"
+HISTORY_COMMIT_INTERVAL = 2
+HISTORY_MAX_EVENT_TYPES = 63
+DEFAULT_QUERY_LIMIT = 100
+MAX_QUERY_LIMIT = 1000
+
+# Stored snapshots (<config>/tplink_vigi/snapshots), indexed in the history
+# database and browsable through the media source
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_RETENTION_DAYS = 14
+MEDIA_PAGE_SIZE = 50
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_CACHE_SIZE = 512
+
+# Snapshot pulls for JSON-only events: total timeout (seconds) and
+# concurrent requests per camera host
+PULL_TIMEOUT = 10
+PULL_MAX_PER_HOST = 2
+
+# Services
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_SELECT_FRAME = "select_frame"
+SERVICE_QUERY_EVENTS = "query_events"
+ATTR_INDEX = "index"
+ATTR_CAMERA = "camera"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_LIMIT = "limit"
+ATTR_CURSOR = "cursor"
+ATTR_PATH = "path"
+ATTR_SPEED = "speed"
+
+# Camera clock skew estimation
+SKEW_WINDOW = 20
+SKEW_MIN_SAMPLES = 3
+SKEW_CORRECTION_THRESHOLD = 5
+
+# Seconds a camera's event waits for its slower in-flight uploads
+EVENT_REORDER_WINDOW = 1.0
+
+# Dispatcher signal sent after each processed event (format with camera_id)
+SIGNAL_CAMERA_EVENT = f"{DOMAIN}_camera_event_{{}}"
+# Dispatcher signal sent for every camera by the activity sweep
+SIGNAL_ACTIVITY_SWEEP = f"{DOMAIN}_activity_sweep"
+
+# Camera activity: EWMA time constant for the event rate and the interval
+# of the shared sweep that refreshes rate, silence and liveness (seconds)
+EVENT_RATE_TIME_CONSTANT = 300
+ACTIVITY_SWEEP_INTERVAL = 30
+
+# Webhook path logging: webhooks logged in full per summary window, then
+# one in LOG_SAMPLE_RATE; summary window length in seconds
+LOG_BURST = 5
+LOG_SAMPLE_RATE = 20
+LOG_SUMMARY_INTERVAL = 60
+
+# Bus events
+EVENT_VIGI = f"{DOMAIN}_event"
+EVENT_VIGI_BATCH = f"{DOMAIN}_events"
+EVENT_BATCH_MAX_SIZE = 100
 
 # Event types (adjust based on your camera's actual events)
 EVENT_MOTION = "motion"
@@ -0,0 +1,118 @@
+"""Snapshot deduplication for TP-Link VIGI cameras.
+
+Static scenes and repeated triggers often deliver the same JPEG again.
+Every snapshot is digested once at ingest; byte-identical repeats are
+caught by the digest alone. Cameras can additionally opt in to a cheap
+perceptual hash (dHash) computed in the executor, which also catches
+re-encoded frames of an unchanged scene.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import PERCEPTUAL_HASH_MAX_DISTANCE
+
+_LOGGER = logging.getLogger(__name__)
+
+# dHash grid: (width, height) of the downscaled grayscale image
+_DHASH_SIZE = (9, 8)
+
+
+def image_digest(image_bytes: bytes) -> bytes:
+    """Return a fast 128-bit content digest of an image."""
+    return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+
+def perceptual_hash(image_bytes: bytes) -> int | None:
+    """Return a 64-bit difference hash of an image (executor).
+
+    Returns None if the image cannot be decoded or Pillow is unavailable.
+    """
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # draft() lets the JPEG decoder downscale by up to 8x while decoding
+            img.draft("L", (_DHASH_SIZE[0] * 8, _DHASH_SIZE[1] * 8))
+            pixels = list(img.convert("L").resize(_DHASH_SIZE).getdata())
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+
+    width = _DHASH_SIZE[0]
+    value = 0
+    for row in range(_DHASH_SIZE[1]):
+        for col in range(width - 1):
+            left = pixels[row * width + col]
+            right = pixels[row * width + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class SnapshotDeduplicator:
+    """Per-camera duplicate snapshot detector with hit counters."""
+
+    def __init__(self, perceptual: bool) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            perceptual: Also compare perceptual hashes of successive snapshots
+        """
+        self._perceptual = perceptual
+        self._last_digest: bytes | None = None
+        self._last_phash: int | None = None
+        self.checked = 0
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+
+    async def async_is_duplicate(
+        self, hass: HomeAssistant, digest: bytes, image_bytes: bytes
+    ) -> bool:
+        """Check a snapshot against the previous one and remember it if new.
+
+        Args:
+            hass: Home Assistant instance
+            digest: Content digest from ``image_digest``
+            image_bytes: Snapshot bytes, only decoded for perceptual hashing
+
+        Returns:
+            True if the snapshot duplicates the last stored one.
+        """
+        self.checked += 1
+        if digest == self._last_digest:
+            self.exact_hits += 1
+            return True
+
+        phash: int | None = None
+        if self._perceptual:
+            phash = await hass.async_add_executor_job(perceptual_hash, image_bytes)
+            if (
+                phash is not None
+                and self._last_phash is not None
+                and (phash ^ self._last_phash).bit_count()
+                <= PERCEPTUAL_HASH_MAX_DISTANCE
+            ):
+                self.perceptual_hits += 1
+                return True
+
+        self._last_digest = digest
+        self._last_phash = phash
+        return False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return dedup counters for diagnostics."""
+        hits = self.exact_hits + self.perceptual_hits
+        return {
+            "checked": self.checked,
+            "exact_hits": self.exact_hits,
+            "perceptual_hits": self.perceptual_hits,
+            "hit_rate": round(hits / self.checked, 4) if self.checked else 0.0,
+        }
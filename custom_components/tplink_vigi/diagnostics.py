@@ -0,0 +1,64 @@
+"""Diagnostics support for TP-Link VIGI."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_SNAPSHOT_URL,
+    CONF_WEBHOOK_ID,
+    DATA_DISPATCHER,
+    DATA_PULLER,
+    DATA_SNAPSHOTS,
+    DOMAIN,
+)
+
+# Webhook IDs are unauthenticated URLs and snapshot URLs may embed camera
+# credentials; neither may leak into shared reports
+TO_REDACT = {CONF_WEBHOOK_ID, CONF_SNAPSHOT_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
+
+    cameras: dict[str, Any] = {}
+    for camera_id, camera_data in entry_data.get("cameras", {}).items():
+        gate = camera_data.get("gate")
+        dedup = camera_data.get("dedup")
+        skew = camera_data.get("skew")
+        uploads = camera_data.get("uploads")
+        frame_budget = camera_data.get("frame_budget")
+        activity = camera_data.get("activity")
+        cameras[camera_id] = {
+            "name": camera_data.get("name"),
+            "last_event": camera_data.get("last_event"),
+            "last_image_size": camera_data.get("last_image_size"),
+            "last_image_info": camera_data.get("last_image_info"),
+            "gate": gate.as_dict() if gate is not None else None,
+            "dedup": dedup.as_dict() if dedup is not None else None,
+            "clock": skew.as_dict() if skew is not None else None,
+            "uploads": uploads.as_dict() if uploads is not None else None,
+            "frame_budget": (
+                frame_budget.as_dict() if frame_budget is not None else None
+            ),
+            "activity": activity.as_dict() if activity is not None else None,
+        }
+
+    dispatcher = hass.data.get(DATA_DISPATCHER)
+    snapshots = hass.data.get(DATA_SNAPSHOTS)
+    puller = hass.data.get(DATA_PULLER)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "cameras": cameras,
+        "bus": dispatcher.as_dict() if dispatcher is not None else None,
+        "snapshots": snapshots.as_dict() if snapshots is not None else None,
+        "pulls": puller.as_dict() if puller is not None else None,
+    }
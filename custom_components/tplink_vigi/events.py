@@ -0,0 +1,98 @@
+"""Home Assistant bus events for TP-Link VIGI detections.
+
+Every detection is announced on the bus as ``tplink_vigi_event`` so
+automations receive it even while the motion sensor is already on.
+Cameras with a batching window instead contribute to a shared
+``tplink_vigi_events`` bus event that groups bursts from all cameras
+with the same window, cutting bus traffic when many cameras fire at
+once. Each window length keeps its own batch, so a camera's detections
+are never held longer than the window configured for it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import EVENT_BATCH_MAX_SIZE, EVENT_VIGI, EVENT_VIGI_BATCH
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventDispatcher:
+    """Fire detection events on the bus, optionally micro-batched."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        # Pending detections and flush timer per batching window length
+        self._pending: dict[float, list[dict[str, Any]]] = {}
+        self._unsub_flush: dict[float, Callable[[], None]] = {}
+        self.detections = 0
+        self.bus_events = 0
+
+    @callback
+    def async_dispatch(self, data: dict[str, Any], window: float) -> None:
+        """Announce one detection.
+
+        Args:
+            data: Event payload
+            window: Batching window in seconds; 0 fires immediately
+        """
+        self.detections += 1
+        if window <= 0:
+            self._hass.bus.async_fire(EVENT_VIGI, data)
+            self.bus_events += 1
+            return
+
+        pending = self._pending.setdefault(window, [])
+        pending.append(data)
+        if len(pending) >= EVENT_BATCH_MAX_SIZE:
+            self._async_flush_window(window)
+        elif window not in self._unsub_flush:
+            # The first detection of a burst sets the deadline for its batch
+            @callback
+            def _async_flush_later(_now: datetime) -> None:
+                """Flush when the batching window closes."""
+                self._unsub_flush.pop(window, None)
+                self._async_flush_window(window)
+
+            self._unsub_flush[window] = async_call_later(
+                self._hass, window, _async_flush_later
+            )
+
+    @callback
+    def async_flush(self) -> None:
+        """Fire all pending detections, one bus event per window."""
+        for window in list(self._pending):
+            self._async_flush_window(window)
+
+    @callback
+    def _async_flush_window(self, window: float) -> None:
+        """Fire the detections pending for one window as one bus event."""
+        if (unsub := self._unsub_flush.pop(window, None)) is not None:
+            unsub()
+        batch = self._pending.pop(window, None)
+        if not batch:
+            return
+
+        self._hass.bus.async_fire(
+            EVENT_VIGI_BATCH, {"count": len(batch), "events": batch}
+        )
+        self.bus_events += 1
+        _LOGGER.debug(
+            "Fired batch of %d VIGI detection(s) (%ss window)", len(batch), window
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return bus traffic counters for diagnostics."""
+        return {
+            "detections": self.detections,
+            "bus_events": self.bus_events,
+            "pending": sum(len(batch) for batch in self._pending.values()),
+        }
@@ -0,0 +1,155 @@
+"""Pre-parse request gate for TP-Link VIGI webhooks.
+
+The gate looks only at request metadata (headers and source address), so
+misconfigured cameras and stray scanners are turned away before the body
+is read or parsed.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from http import HTTPStatus
+import logging
+import time
+from typing import Any
+
+from .const import (
+    ACCEPTED_CONTENT_TYPES,
+    MAX_REQUEST_BYTES,
+    SOURCE_PIN_TTL,
+    RATE_LIMIT_BURST,
+    REJECT_CONTENT_TYPE,
+    REJECT_RATE_LIMITED,
+    REJECT_SOURCE,
+    REJECT_TOO_LARGE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# HTTP status returned to the sender for each rejection reason
+REJECT_STATUS: dict[str, HTTPStatus] = {
+    REJECT_TOO_LARGE: HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+    REJECT_CONTENT_TYPE: HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+    REJECT_SOURCE: HTTPStatus.FORBIDDEN,
+    REJECT_RATE_LIMITED: HTTPStatus.TOO_MANY_REQUESTS,
+}
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens/second."""
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Take one token if available."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class WebhookGate:
+    """Per-camera admission checks applied before the body is read."""
+
+    def __init__(self, rate_limit: float, restrict_source: bool) -> None:
+        """Initialize the gate.
+
+        Args:
+            rate_limit: Sustained requests per second allowed; 0 disables
+            restrict_source: Only accept requests from the camera's known IP
+        """
+        self._bucket = (
+            TokenBucket(rate_limit, max(RATE_LIMIT_BURST, rate_limit))
+            if rate_limit > 0
+            else None
+        )
+        self._restrict_source = restrict_source
+        self.known_ip: str | None = None
+        # time.monotonic() of the last accepted request from known_ip
+        self._known_ip_seen = 0.0
+        self.accepted = 0
+        self.rejected: Counter[str] = Counter()
+
+    def check(self, request: Any) -> str | None:
+        """Check a request against the gate.
+
+        Args:
+            request: Incoming aiohttp request (body not yet read)
+
+        Returns:
+            Rejection reason, or None if the request may proceed.
+        """
+        reason = self._check(request)
+        if reason is None:
+            self.accepted += 1
+        else:
+            self.rejected[reason] += 1
+        return reason
+
+    def _check(self, request: Any) -> str | None:
+        """Run the checks cheapest first."""
+        content_length: int | None = request.content_length
+        if content_length is not None and content_length > MAX_REQUEST_BYTES:
+            return REJECT_TOO_LARGE
+
+        content_type: str = request.headers.get("Content-Type", "")
+        if content_type and not content_type.lower().startswith(
+            ACCEPTED_CONTENT_TYPES
+        ):
+            return REJECT_CONTENT_TYPE
+
+        # The camera's IP is learned from its events; a pin that has seen
+        # no traffic for SOURCE_PIN_TTL lapses so a readdressed camera
+        # (e.g. a new DHCP lease) is let back in
+        if self._restrict_source and self.known_ip is not None:
+            now = time.monotonic()
+            if request.remote == self.known_ip:
+                self._known_ip_seen = now
+            elif now - self._known_ip_seen < SOURCE_PIN_TTL:
+                return REJECT_SOURCE
+
+        if self._bucket is not None and not self._bucket.try_acquire():
+            return REJECT_RATE_LIMITED
+
+        return None
+
+    def learn_source(self, remote: str | None, reported_ip: str | None) -> None:
+        """Pin the camera's source address after a valid event.
+
+        Only an address the camera reports for itself in the event
+        payload is pinned, so a sender that merely knows the webhook URL
+        cannot claim the pin from another host.
+
+        Args:
+            remote: Source address of the request
+            reported_ip: ``ip`` field of the event payload
+        """
+        if remote is None or remote != reported_ip:
+            return
+        if self.known_ip is not None and remote != self.known_ip:
+            # Only reached after the old pin lapsed in _check
+            _LOGGER.info(
+                "Camera source address changed from %s to %s", self.known_ip, remote
+            )
+        self.known_ip = remote
+        self._known_ip_seen = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return gate counters for diagnostics."""
+        return {
+            "accepted": self.accepted,
+            "rejected": dict(self.rejected),
+            "known_ip": self.known_ip,
+        }
@@ -6,20 +6,27 @@ from datetime import datetime
 import logging
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant.components.image import ImageEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_INDEX,
     CONF_CAMERA_ID,
     CONF_RESET_DELAY,
     CONF_WEBHOOK_ID,
     DOMAIN,
+    SERVICE_SELECT_FRAME,
 )
+from .imageinfo import ImageInfo, scan_image
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -60,6 +67,14 @@ async def async_setup_entry(
 
     async_add_entities(images, True)
 
+    # Lets dashboards and scripts step through the frames of the latest event
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SELECT_FRAME,
+        {vol.Required(ATTR_INDEX): vol.Coerce(int)},
+        "async_select_frame",
+    )
+
 
 async def async_unload_entry(
     hass: HomeAssistant,
@@ -93,8 +108,17 @@ class VigiCameraImage(ImageEntity):
         self._attr_unique_id = f"{entry.entry_id}_{camera_id}_last_image"
         self._attr_content_type = "image/jpeg"  # Default, updated dynamically
         self._image_bytes: bytes | None = None
+        self._image_digest: bytes | None = None
         self._image_last_updated: datetime | None = None
         self._image_size: int = 0
+        self._frames: list[tuple[bytes, str]] = []
+        self._frames_info: list[ImageInfo] = []
+        # Header metadata of the frame being served
+        self._image_info: ImageInfo | None = None
+        # The event's last frame was salvaged from an interrupted upload
+        self._last_frame_partial = False
+        # Frame served by async_image(); negative values count from the end
+        self._frame_index: int = -1
 
     @property
     def state(self) -> str | None:
@@ -114,6 +138,19 @@ class VigiCameraImage(ImageEntity):
         if self._image_size > 0:
             attributes["image_size"] = self._image_size
 
+        if self._frames:
+            attributes["frame_count"] = len(self._frames)
+            attributes["frame_index"] = self._frame_index % len(self._frames)
+            attributes["partial"] = self._last_frame_partial and (
+                attributes["frame_index"] == len(self._frames) - 1
+            )
+
+        if self._image_info is not None:
+            attributes["image_format"] = self._image_info.format
+            attributes["width"] = self._image_info.width
+            attributes["height"] = self._image_info.height
+            attributes["truncated"] = self._image_info.truncated
+
         return attributes
 
     @property
@@ -131,30 +168,82 @@ class VigiCameraImage(ImageEntity):
 
         Reads image data from hass.data storage, populated by webhook handler.
         """
+        if self._load_latest_event():
+            # Notify Home Assistant of state change
+            self.async_write_ha_state()
+
+        return self._image_bytes
+
+    def _load_latest_event(self) -> bool:
+        """Pick up the latest event's frames from hass.data if they changed.
+
+        Returns:
+            True if a new event was loaded.
+        """
         # Try to get image from hass.data (updated by webhook handler)
         try:
             camera_data = self._hass.data[DOMAIN][self._entry.entry_id]["cameras"][self._camera_id]
-            image_bytes = camera_data.get("last_image")
-
-            if image_bytes and image_bytes != self._image_bytes:
-                # New image available, update internal state
-                self._image_bytes = image_bytes
-                self._image_last_updated = camera_data.get("last_image_time", dt_util.now())
-                self._image_size = camera_data.get("last_image_size", len(image_bytes))
-
-                _LOGGER.debug(
-                    "Image entity %s loaded new image: %d bytes",
-                    self._attr_name,
-                    self._image_size,
-                )
-                
-                # Notify Home Assistant of state change
-                self.async_write_ha_state()
         except KeyError:
             # Camera data not found (integration unloaded or camera removed)
-            pass
+            return False
+
+        image_bytes = camera_data.get("last_image")
+        digest = camera_data.get("last_image_digest")
+
+        # Compare the ingest digest instead of the image bytes
+        if not image_bytes or digest == self._image_digest:
+            return False
+
+        # New image available, update internal state
+        self._image_digest = digest
+        self._frames = camera_data.get("last_frames") or [
+            (image_bytes, camera_data.get("last_image_content_type") or "image/jpeg")
+        ]
+        self._frames_info = camera_data.get("last_frames_info") or []
+        self._last_frame_partial = bool(camera_data.get("last_image_partial"))
+        # A new event always starts on its primary (last) frame
+        self._frame_index = -1
+        self._select_frame()
+        self._image_last_updated = camera_data.get("last_image_time", dt_util.now())
 
-        return self._image_bytes
+        _LOGGER.debug(
+            "Image entity %s loaded new image: %d bytes, %d frame(s)",
+            self._attr_name,
+            self._image_size,
+            len(self._frames),
+        )
+        return True
+
+    def _select_frame(self) -> None:
+        """Point the served image at the selected frame."""
+        self._image_bytes, self._attr_content_type = self._frames[self._frame_index]
+        self._image_size = len(self._image_bytes)
+        # Metadata recorded at ingest; scan the headers if there is none
+        if len(self._frames_info) == len(self._frames):
+            self._image_info = self._frames_info[self._frame_index]
+        else:
+            self._image_info = scan_image(self._image_bytes)
+
+    async def async_select_frame(self, index: int) -> None:
+        """Serve a different frame of the latest event.
+
+        Args:
+            index: Frame position; negative values count from the last frame
+
+        Raises:
+            HomeAssistantError: If the latest event has no such frame.
+        """
+        self._load_latest_event()
+        if not -len(self._frames) <= index < len(self._frames):
+            raise HomeAssistantError(
+                f"Frame {index} out of range for {self._attr_name} "
+                f"({len(self._frames)} frame(s) available)"
+            )
+
+        self._frame_index = index
+        self._select_frame()
+        self._image_last_updated = dt_util.now()
+        self.async_write_ha_state()
 
     def update_image(
         self,
@@ -0,0 +1,198 @@
+"""Header-level image inspection for TP-Link VIGI snapshots.
+
+Works on JPEG marker segments and PNG chunks; image data is never
+decoded. GIF and WebP are recognised by their signature only, so their
+integrity is unknown.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+from .const import SALVAGE_MIN_SCAN_BYTES
+
+_SOI = b"\xff\xd8"
+_EOI = b"\xff\xd9"
+_SOS = 0xDA
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_IEND = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+_GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+_RIFF = b"RIFF"
+_WEBP = b"WEBP"
+
+# Markers that stand alone without a length field
+_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD8)})
+# Start-of-frame markers carrying the image dimensions (not DHT/JPG/DAC)
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class ImageInfo:
+    """Format, dimensions and integrity of an image, read from its headers."""
+
+    __slots__ = ("format", "content_type", "width", "height", "truncated")
+
+    def __init__(
+        self,
+        image_format: str,
+        content_type: str,
+        width: int | None,
+        height: int | None,
+        truncated: bool | None,
+    ) -> None:
+        """Initialize the result."""
+        self.format = image_format
+        self.content_type = content_type
+        self.width = width
+        self.height = height
+        # The data ends before the format's end marker; None if the
+        # format is recognised by its signature only
+        self.truncated = truncated
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metadata as attributes."""
+        return {
+            "format": self.format,
+            "width": self.width,
+            "height": self.height,
+            "truncated": self.truncated,
+        }
+
+
+def _jpeg_segments(view: memoryview) -> Iterator[tuple[int, int, int]]:
+    """Yield ``(marker, payload start, segment end)`` up to and including SOS.
+
+    Stops early when the headers are cut off or malformed; the caller
+    tells the cases apart by whether SOS was reached.
+    """
+    pos = 2
+    size = len(view)
+    while pos + 4 <= size:
+        if view[pos] != 0xFF:
+            return
+        marker = view[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            pos += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            pos += 2
+            continue
+        length = (view[pos + 2] << 8) | view[pos + 3]
+        if length < 2:
+            return
+        end = pos + 2 + length
+        yield marker, pos + 4, end
+        if marker == _SOS:
+            return
+        pos = end
+
+
+def jpeg_scan_offset(data: bytes) -> int | None:
+    """Return the offset where the first JPEG scan's entropy data starts.
+
+    Walks the marker segments from SOI to SOS using their length fields.
+
+    Args:
+        data: JPEG bytes, possibly truncated
+
+    Returns:
+        Offset just past the SOS header, or None if the headers are
+        incomplete or not JPEG.
+    """
+    if not data.startswith(_SOI):
+        return None
+    view = memoryview(data)
+    for marker, _, end in _jpeg_segments(view):
+        if marker == _SOS:
+            return end if end <= len(view) else None
+    return None
+
+
+def _scan_jpeg(view: memoryview) -> ImageInfo:
+    """Read dimensions from the first SOF segment of a JPEG."""
+    width: int | None = None
+    height: int | None = None
+    reached_scan = False
+    for marker, start, end in _jpeg_segments(view):
+        if end > len(view):
+            break
+        if marker in _SOF_MARKERS and end - start >= 5:
+            height = (view[start + 1] << 8) | view[start + 2]
+            width = (view[start + 3] << 8) | view[start + 4]
+        elif marker == _SOS:
+            reached_scan = True
+    # Some encoders pad the file after EOI
+    tail = bytes(view[-64:]).rstrip(b"\x00")
+    truncated = not reached_scan or not tail.endswith(_EOI)
+    return ImageInfo("jpeg", "image/jpeg", width, height, truncated)
+
+
+def _scan_png(view: memoryview) -> ImageInfo:
+    """Read dimensions from the IHDR chunk of a PNG."""
+    width: int | None = None
+    height: int | None = None
+    # Signature, then IHDR: length (4), type (4), width (4), height (4)
+    if len(view) >= 24 and bytes(view[12:16]) == b"IHDR":
+        width = int.from_bytes(view[16:20], "big")
+        height = int.from_bytes(view[20:24], "big")
+    truncated = width is None or view[-12:] != _PNG_IEND
+    return ImageInfo("png", "image/png", width, height, truncated)
+
+
+def _scan_gif(view: memoryview) -> ImageInfo:
+    """Read dimensions from the logical screen descriptor of a GIF."""
+    width: int | None = None
+    height: int | None = None
+    if len(view) >= 10:
+        width = int.from_bytes(view[6:8], "little")
+        height = int.from_bytes(view[8:10], "little")
+    return ImageInfo("gif", "image/gif", width, height, None)
+
+
+def scan_image(data: bytes) -> ImageInfo | None:
+    """Identify an image by its signature and read what its headers hold.
+
+    JPEG and PNG dimensions and integrity come from their headers and
+    last few bytes; GIF dimensions from its screen descriptor. WebP is
+    only identified. Everything is read through a memoryview, so the
+    image body is never copied.
+
+    Args:
+        data: Image bytes as received
+
+    Returns:
+        Header metadata, or None if the data is not a JPEG, PNG, GIF or
+        WebP image.
+    """
+    view = memoryview(data)
+    if view[:2] == _SOI:
+        return _scan_jpeg(view)
+    if view[:8] == _PNG_SIGNATURE:
+        return _scan_png(view)
+    if bytes(view[:6]) in _GIF_SIGNATURES:
+        return _scan_gif(view)
+    if view[:4] == _RIFF and view[8:12] == _WEBP:
+        return ImageInfo("webp", "image/webp", None, None, None)
+    return None
+
+
+def salvage_jpeg(data: bytes) -> bytes | None:
+    """Make a truncated JPEG displayable, if enough of it arrived.
+
+    A JPEG whose headers are complete and whose first scan has started
+    decodes to a partial picture (the missing rows render grey) once it
+    is terminated with an EOI marker.
+
+    Args:
+        data: Bytes received before the upload was interrupted
+
+    Returns:
+        Terminated JPEG bytes, or None if too little arrived to decode.
+    """
+    scan = jpeg_scan_offset(data)
+    if scan is None or len(data) - scan < SALVAGE_MIN_SCAN_BYTES:
+        return None
+    if data.endswith(_EOI):
+        return data
+    return data + _EOI
@@ -0,0 +1,139 @@
+"""Sampled, rate-limited logging for the TP-Link VIGI webhook path.
+
+A busy camera produces several log lines per webhook. Each camera's
+lines are grouped by webhook: the first LOG_BURST webhooks of every
+LOG_SUMMARY_INTERVAL window are logged in full, after that only every
+LOG_SAMPLE_RATE-th one. Suppressed work is still counted, and one
+summary line per window reports webhooks, events, images, bytes and
+errors, so quiet cameras keep their full log and busy ones get totals.
+
+Level checks happen before any argument is formatted; when a level is
+disabled a call costs a cached ``isEnabledFor`` lookup.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .const import LOG_BURST, LOG_SAMPLE_RATE, LOG_SUMMARY_INTERVAL
+
+
+class IngestLog:
+    """Per-camera logger for the webhook hot path."""
+
+    __slots__ = (
+        "_logger",
+        "_name",
+        "_window_start",
+        "_verbose",
+        "webhooks",
+        "events",
+        "images",
+        "bytes",
+        "errors",
+        "suppressed",
+        "suppressed_warnings",
+    )
+
+    def __init__(self, logger: logging.Logger, name: str) -> None:
+        """Initialize the logger.
+
+        Args:
+            logger: Module logger the lines are written to
+            name: Camera entity name used in the summary line
+        """
+        self._logger = logger
+        self._name = name
+        self._window_start = time.monotonic()
+        self._verbose = True
+        self._reset_counts()
+
+    def _reset_counts(self) -> None:
+        """Start a new summary window."""
+        self.webhooks = 0
+        self.events = 0
+        self.images = 0
+        self.bytes = 0
+        self.errors = 0
+        self.suppressed = 0
+        self.suppressed_warnings = 0
+
+    def begin_webhook(self, size: int | None) -> None:
+        """Count a webhook and decide whether its lines are logged.
+
+        Args:
+            size: Request body size, if known
+        """
+        self.flush_if_due()
+        self.webhooks += 1
+        if size:
+            self.bytes += size
+        self._verbose = (
+            self.webhooks <= LOG_BURST or self.webhooks % LOG_SAMPLE_RATE == 0
+        )
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a sampled debug line."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        if self._verbose:
+            self._logger.debug(msg, *args)
+        else:
+            self.suppressed += 1
+
+    def add_images(self, count: int) -> None:
+        """Count images received or pulled for the current webhook."""
+        self.images += count
+
+    def event(self, msg: str, *args: Any) -> None:
+        """Count an applied event and log its sampled info line."""
+        self.events += 1
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        if self._verbose:
+            self._logger.info(msg, *args)
+        else:
+            self.suppressed += 1
+
+    def warning(self, msg: str, *args: Any) -> None:
+        """Count an error and log its sampled warning line."""
+        self.errors += 1
+        if not self._logger.isEnabledFor(logging.WARNING):
+            return
+        if self._verbose:
+            self._logger.warning(msg, *args)
+        else:
+            self.suppressed += 1
+            self.suppressed_warnings += 1
+
+    def flush_if_due(self) -> None:
+        """Write the summary line once the current window has elapsed.
+
+        The summary is only written for windows that suppressed lines;
+        otherwise every line of the window is already in the log. It is
+        a warning when warnings were suppressed, so it shows at the
+        default log level.
+        """
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < LOG_SUMMARY_INTERVAL:
+            return
+        level = logging.WARNING if self.suppressed_warnings else logging.INFO
+        if self.suppressed and self._logger.isEnabledFor(level):
+            self._logger.log(
+                level,
+                "%s: %d webhook(s), %d event(s), %d image(s), %d bytes, "
+                "%d error(s) in the last %ds; %d log line(s) suppressed",
+                self._name,
+                self.webhooks,
+                self.events,
+                self.images,
+                self.bytes,
+                self.errors,
+                round(elapsed),
+                self.suppressed,
+            )
+        self._window_start = now
+        self._reset_counts()
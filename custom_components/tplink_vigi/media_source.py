@@ -0,0 +1,192 @@
+"""Media source for browsing stored TP-Link VIGI snapshots.
+
+Media tree: cameras -> days -> snapshots. Day and snapshot listings come
+from the history database's snapshot index, one page at a time, so a
+camera with a long archive opens without touching the image files.
+
+Identifiers:
+    ``<camera_id>``                       days with snapshots
+    ``<camera_id>/<YYYYMMDD>``            first page of a day
+    ``<camera_id>/<YYYYMMDD>/<cursor>``   following pages of a day
+    ``snapshot/<path>``                   one stored snapshot
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import mimetypes
+from typing import Any
+
+from homeassistant.components.media_player import MediaClass, MediaType
+from homeassistant.components.media_source.error import Unresolvable
+from homeassistant.components.media_source.models import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_HISTORY, DATA_SNAPSHOTS, DOMAIN, MEDIA_PAGE_SIZE
+from .history import EventHistory
+from .snapshots import SNAPSHOT_URL, THUMBNAIL_URL, SnapshotStore
+
+_SNAPSHOT_PREFIX = "snapshot/"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> VigiMediaSource:
+    """Set up the TP-Link VIGI media source."""
+    return VigiMediaSource(hass)
+
+
+class VigiMediaSource(MediaSource):
+    """Browse stored camera snapshots by camera and day."""
+
+    name = "TP-Link VIGI"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve a snapshot to a URL."""
+        identifier = item.identifier or ""
+        if not identifier.startswith(_SNAPSHOT_PREFIX):
+            raise Unresolvable(f"Unknown snapshot identifier: {identifier}")
+        path = identifier.removeprefix(_SNAPSHOT_PREFIX)
+        mime_type = mimetypes.guess_type(path)[0] or "image/jpeg"
+        return PlayMedia(f"{SNAPSHOT_URL}/{path}", mime_type)
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Return one level of the snapshot tree."""
+        history: EventHistory | None = self.hass.data.get(DATA_HISTORY)
+        store: SnapshotStore | None = self.hass.data.get(DATA_SNAPSHOTS)
+        if history is None or store is None:
+            raise Unresolvable("Snapshot storage is not available")
+
+        identifier = item.identifier or ""
+        if not identifier:
+            return self._browse_root()
+
+        camera_id, _, rest = identifier.partition("/")
+        names = self._camera_names()
+        if camera_id not in names:
+            raise Unresolvable(f"Unknown camera: {camera_id}")
+        if not rest:
+            return await self._async_browse_camera(history, camera_id, names[camera_id])
+
+        day_str, _, cursor = rest.partition("/")
+        try:
+            day = datetime.strptime(day_str, "%Y%m%d").date()
+        except ValueError as e:
+            raise Unresolvable(f"Invalid day: {day_str}") from e
+        try:
+            return await self._async_browse_day(
+                history, camera_id, names[camera_id], day, cursor or None
+            )
+        except ValueError as e:
+            raise Unresolvable(f"Invalid page cursor: {cursor}") from e
+
+    def _camera_names(self) -> dict[str, str]:
+        """Return camera_id -> name for every loaded camera."""
+        return {
+            camera_id: camera_data.get("name", camera_id)
+            for entry_data in self.hass.data.get(DOMAIN, {}).values()
+            for camera_id, camera_data in entry_data.get("cameras", {}).items()
+        }
+
+    def _browse_root(self) -> BrowseMediaSource:
+        """List cameras."""
+        return _folder(
+            "",
+            self.name,
+            [
+                _folder(camera_id, name)
+                for camera_id, name in sorted(
+                    self._camera_names().items(), key=lambda item: item[1]
+                )
+            ],
+        )
+
+    async def _async_browse_camera(
+        self, history: EventHistory, camera_id: str, name: str
+    ) -> BrowseMediaSource:
+        """List the days that have snapshots, newest first."""
+        days = await history.async_snapshot_days(camera_id)
+        return _folder(
+            camera_id,
+            name,
+            [
+                _folder(f"{camera_id}/{day:%Y%m%d}", day.isoformat())
+                for day in days
+            ],
+        )
+
+    async def _async_browse_day(
+        self,
+        history: EventHistory,
+        camera_id: str,
+        name: str,
+        day: date,
+        cursor: str | None,
+    ) -> BrowseMediaSource:
+        """List one page of a day's snapshots, newest first."""
+        start = dt_util.start_of_local_day(day)
+        end = dt_util.start_of_local_day(day + timedelta(days=1))
+        page = await history.async_list_snapshots(
+            camera_id, start, end, MEDIA_PAGE_SIZE, cursor
+        )
+
+        children: list[BrowseMediaSource] = [
+            _snapshot(snapshot) for snapshot in page["snapshots"]
+        ]
+        if page["next_cursor"]:
+            children.append(
+                _folder(f"{camera_id}/{day:%Y%m%d}/{page['next_cursor']}", "More…")
+            )
+
+        base = f"{camera_id}/{day:%Y%m%d}"
+        return _folder(
+            f"{base}/{cursor}" if cursor else base,
+            f"{name} – {day.isoformat()}",
+            children,
+            MediaClass.IMAGE,
+        )
+
+
+def _folder(
+    identifier: str,
+    title: str,
+    children: list[BrowseMediaSource] | None = None,
+    children_media_class: str = MediaClass.DIRECTORY,
+) -> BrowseMediaSource:
+    """Build a browsable directory node."""
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=identifier,
+        media_class=MediaClass.DIRECTORY,
+        media_content_type=MediaType.IMAGE,
+        title=title,
+        can_play=False,
+        can_expand=True,
+        children=children,
+        children_media_class=children_media_class,
+    )
+
+
+def _snapshot(snapshot: dict[str, Any]) -> BrowseMediaSource:
+    """Build a leaf node for one stored snapshot."""
+    path: str = snapshot["path"]
+    event_time: datetime = snapshot["event_time"]
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=f"{_SNAPSHOT_PREFIX}{path}",
+        media_class=MediaClass.IMAGE,
+        media_content_type=snapshot["content_type"],
+        title=event_time.strftime("%H:%M:%S"),
+        can_play=True,
+        can_expand=False,
+        thumbnail=f"{THUMBNAIL_URL}/{path}",
+    )
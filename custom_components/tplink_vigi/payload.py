@@ -0,0 +1,392 @@
+"""Buffered webhook payloads for TP-Link VIGI cameras.
+
+The webhook handler normally streams multipart bodies straight off the
+aiohttp request. When the full body is already in memory (capture mode,
+replayed archives) the classes below expose the same small surface the
+handler relies on, so both paths share one parsing routine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Mapping
+import json
+from typing import Any
+
+from aiohttp.multipart import parse_content_disposition
+from multidict import CIMultiDict
+
+from .const import IMAGE_READ_CHUNK, MAX_EVENT_FRAME_BYTES, MAX_EVENT_FRAMES
+
+_CRLF = b"\r\n"
+_HEADER_END = b"\r\n\r\n"
+
+
+def get_boundary(content_type: str) -> str | None:
+    """Extract the multipart boundary from a Content-Type header value.
+
+    Args:
+        content_type: Raw Content-Type header (e.g. ``multipart/form-data; boundary=x``)
+
+    Returns:
+        The boundary string, or None if the header carries no boundary.
+    """
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary" and value:
+            return value.strip('"')
+    return None
+
+
+class BufferedPart:
+    """A single multipart body part held in memory."""
+
+    def __init__(self, headers: CIMultiDict[str], data: bytes) -> None:
+        """Initialize the part."""
+        self.headers = headers
+        self.data = data
+        _, params = parse_content_disposition(headers.get("Content-Disposition"))
+        self.name: str | None = params.get("name")
+        self.filename: str | None = params.get("filename")
+        self._offset = 0
+
+    async def read(self) -> bytes:
+        """Return the part body."""
+        return self.data
+
+    async def read_chunk(self, size: int = IMAGE_READ_CHUNK) -> bytes:
+        """Return the next ``size`` bytes of the body, or b"" at the end."""
+        chunk = self.data[self._offset : self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+    async def json(self) -> Any:
+        """Decode the part body as JSON."""
+        if not self.data:
+            return None
+        return json.loads(self.data.decode("utf-8"))
+
+
+class FrameBudget:
+    """Image bytes one camera may hold in events not yet applied.
+
+    Shared by all of a camera's requests, so a burst of concurrent
+    uploads cannot buffer more than ``limit`` bytes between them.
+    """
+
+    __slots__ = ("limit", "used", "exhausted")
+
+    def __init__(self, limit: int) -> None:
+        """Initialize an empty budget."""
+        self.limit = limit
+        self.used = 0
+        # Frames dropped because the budget was spent
+        self.exhausted = 0
+
+    def take(self, size: int) -> bool:
+        """Take ``size`` bytes if they fit."""
+        if self.used + size > self.limit:
+            return False
+        self.used += size
+        return True
+
+    def release(self, size: int) -> None:
+        """Give back ``size`` bytes."""
+        self.used -= size
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return budget state for diagnostics."""
+        return {
+            "limit": self.limit,
+            "used": self.used,
+            "exhausted": self.exhausted,
+        }
+
+
+class FrameReservation:
+    """Bytes one request holds from its camera's frame budget.
+
+    Released in full once the request's event has been applied, or as
+    soon as the request turns out not to carry one.
+    """
+
+    __slots__ = ("_budget", "size")
+
+    def __init__(self, budget: FrameBudget) -> None:
+        """Initialize an empty reservation."""
+        self._budget = budget
+        self.size = 0
+
+    def take(self, size: int) -> bool:
+        """Take ``size`` more bytes, counting a drop if they do not fit."""
+        if not self._budget.take(size):
+            self._budget.exhausted += 1
+            return False
+        self.size += size
+        return True
+
+    def release(self, size: int | None = None) -> None:
+        """Give back ``size`` bytes, or everything held by default."""
+        if size is None or size > self.size:
+            size = self.size
+        self._budget.release(size)
+        self.size -= size
+
+
+async def read_part_salvaging(
+    part: Any,
+    limit: int = MAX_EVENT_FRAME_BYTES,
+    reservation: FrameReservation | None = None,
+) -> tuple[bytes | None, bool]:
+    """Read a multipart part chunk by chunk, keeping what arrived on timeout.
+
+    ``part.read()`` discards everything already received when the upload
+    stalls; reading in chunks keeps the prefix so the caller can try to
+    salvage it. Reading stops as soon as the part outgrows ``limit`` or
+    the camera's frame budget, so a chunked upload without a
+    Content-Length cannot grow the buffer past either.
+
+    Args:
+        part: aiohttp ``BodyPartReader`` or ``BufferedPart``
+        limit: Most bytes the part may hold
+        reservation: Request's share of the camera's frame budget; each
+            chunk is taken from it as it arrives
+
+    Returns:
+        The bytes received, or None if the part exceeded ``limit`` or
+        the budget, and whether the part was read to its end.
+    """
+    buffer = bytearray()
+    try:
+        while chunk := await part.read_chunk(IMAGE_READ_CHUNK):
+            buffer += chunk
+            if len(buffer) > limit or (
+                reservation is not None and not reservation.take(len(chunk))
+            ):
+                if reservation is not None:
+                    # Give back what this part took; the last chunk was not taken
+                    reservation.release(len(buffer) - len(chunk))
+                return None, False
+    except asyncio.TimeoutError:
+        return bytes(buffer), False
+    return bytes(buffer), True
+
+
+class UploadStats:
+    """Per-camera counters for how image uploads finished."""
+
+    __slots__ = ("started", "complete", "salvaged", "lost", "cut_off")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.started = 0
+        self.complete = 0
+        # Interrupted uploads kept as partial images
+        self.salvaged = 0
+        # Interrupted uploads too short to decode
+        self.lost = 0
+        # Requests that timed out outside an image part (boundary, part
+        # headers or event JSON); what was parsed before is kept
+        self.cut_off = 0
+
+    @property
+    def completion_rate(self) -> float | None:
+        """Return the share of uploads that arrived in full."""
+        if not self.started:
+            return None
+        return self.complete / self.started
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return upload counters for diagnostics."""
+        rate = self.completion_rate
+        return {
+            "started": self.started,
+            "complete": self.complete,
+            "salvaged": self.salvaged,
+            "lost": self.lost,
+            "cut_off": self.cut_off,
+            "completion_rate": round(rate, 4) if rate is not None else None,
+        }
+
+
+def split_multipart(body: bytes, boundary: str) -> list[BufferedPart]:
+    """Split a multipart body into its parts.
+
+    Parsing is tolerant: a missing closing delimiter keeps whatever parts
+    were complete, matching how the streaming reader behaves on truncated
+    uploads.
+
+    Args:
+        body: Complete request body
+        boundary: Boundary taken from the Content-Type header
+
+    Returns:
+        Parts in the order they appear in the body.
+
+    Raises:
+        ValueError: If the body does not start with the boundary delimiter.
+    """
+    delimiter = b"--" + boundary.encode("latin-1")
+    view = memoryview(body)
+    start = body.find(delimiter)
+    if start < 0:
+        raise ValueError("Multipart boundary not found in body")
+
+    parts: list[BufferedPart] = []
+    pos = start + len(delimiter)
+    while True:
+        # "--" directly after a delimiter marks the closing boundary
+        if body[pos : pos + 2] == b"--":
+            break
+        if body[pos : pos + 2] == _CRLF:
+            pos += 2
+
+        header_end = body.find(_HEADER_END, pos)
+        if header_end < 0:
+            break
+        headers: CIMultiDict[str] = CIMultiDict()
+        for line in body[pos:header_end].split(_CRLF):
+            name, sep, value = line.decode("latin-1").partition(":")
+            if sep:
+                headers.add(name.strip(), value.strip())
+
+        data_start = header_end + len(_HEADER_END)
+        next_delim = body.find(_CRLF + delimiter, data_start)
+        if next_delim < 0:
+            break
+        parts.append(BufferedPart(headers, bytes(view[data_start:next_delim])))
+        pos = next_delim + len(_CRLF) + len(delimiter)
+
+    return parts
+
+
+class BufferedMultipartReader:
+    """Async iterator over the parts of a buffered multipart body."""
+
+    def __init__(self, parts: list[BufferedPart]) -> None:
+        """Initialize the reader."""
+        self._parts = parts
+
+    async def __aiter__(self) -> AsyncIterator[BufferedPart]:
+        """Yield each part in order."""
+        for part in self._parts:
+            yield part
+
+
+class BufferedRequest:
+    """Minimal stand-in for an aiohttp request whose body is already read."""
+
+    def __init__(
+        self,
+        headers: Mapping[str, str],
+        body: bytes,
+        remote: str | None = None,
+        replayed: bool = False,
+    ) -> None:
+        """Initialize the request.
+
+        Args:
+            headers: Original request headers
+            body: Complete request body
+            remote: Source address of the original request
+            replayed: True when the request comes from a capture archive
+        """
+        self.headers: CIMultiDict[str] = CIMultiDict(headers)
+        self.remote = remote
+        self.replayed = replayed
+        self._body = body
+
+    @property
+    def content_length(self) -> int:
+        """Return the body length."""
+        return len(self._body)
+
+    async def read(self) -> bytes:
+        """Return the raw body."""
+        return self._body
+
+    async def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self._body.decode("utf-8"))
+
+    async def multipart(self) -> BufferedMultipartReader:
+        """Return a reader over the multipart parts of the body.
+
+        Raises:
+            ValueError: If the body is not valid multipart data.
+        """
+        boundary = get_boundary(self.headers.get("Content-Type", ""))
+        if boundary is None:
+            raise ValueError("Missing multipart boundary in Content-Type")
+        return BufferedMultipartReader(split_multipart(self._body, boundary))
+
+
+class ParsedPayload:
+    """Compact result of parsing a buffered webhook body."""
+
+    __slots__ = ("event_data", "images", "errors")
+
+    def __init__(self) -> None:
+        """Initialize an empty result."""
+        self.event_data: dict[str, Any] | None = None
+        # (image bytes, content type) in the order the parts arrived,
+        # capped at MAX_EVENT_FRAMES / MAX_EVENT_FRAME_BYTES
+        self.images: list[tuple[bytes, str]] = []
+        # Problems found while parsing, logged by the caller on the event loop
+        self.errors: list[str] = []
+
+
+def parse_payload(content_type: str, body: bytes) -> ParsedPayload:
+    """Parse a complete webhook body into event data and images.
+
+    Pure function with no Home Assistant dependencies so it can run off
+    the event loop.
+
+    Args:
+        content_type: Request Content-Type header
+        body: Complete request body
+
+    Returns:
+        Parsed event data, images and any parse errors.
+    """
+    result = ParsedPayload()
+
+    if "multipart/form-data" not in content_type:
+        try:
+            result.event_data = json.loads(body.decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            result.errors.append(f"Malformed JSON body: {e}")
+        return result
+
+    boundary = get_boundary(content_type)
+    if boundary is None:
+        result.errors.append("Missing multipart boundary in Content-Type")
+        return result
+
+    try:
+        parts = split_multipart(body, boundary)
+    except ValueError as e:
+        result.errors.append(f"Malformed multipart data: {e}")
+        return result
+
+    frames_size = 0
+    for part in parts:
+        if part.name == "event":
+            try:
+                result.event_data = json.loads(part.data.decode("utf-8"))
+            except (ValueError, UnicodeDecodeError) as e:
+                result.errors.append(f"Malformed JSON in 'event' part: {e}")
+        elif len(result.images) >= MAX_EVENT_FRAMES:
+            continue
+        elif frames_size + len(part.data) > MAX_EVENT_FRAME_BYTES:
+            result.errors.append(
+                f"Dropped {len(part.data)} byte image from field '{part.name}': "
+                f"event exceeds {MAX_EVENT_FRAME_BYTES} byte frame budget"
+            )
+        else:
+            result.images.append(
+                (part.data, part.headers.get("Content-Type", "image/jpeg"))
+            )
+            frames_size += len(part.data)
+
+    return result
@@ -0,0 +1,114 @@
+"""On-demand snapshot pulls for TP-Link VIGI cameras.
+
+Some cameras post JSON-only webhooks without an image. For those, a
+snapshot URL can be configured per camera and the integration fetches
+the picture itself after each event.
+
+All pulls go through one pooled HTTP session with keep-alive, so
+repeated fetches from the same camera reuse their connection. Each
+camera host gets at most PULL_MAX_PER_HOST concurrent requests, and a
+burst of events for one camera shares a single in-flight fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from .const import (
+    IMAGE_READ_CHUNK,
+    MAX_EVENT_FRAME_BYTES,
+    PULL_MAX_PER_HOST,
+    PULL_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotPuller:
+    """Fetch camera snapshots over a shared connection pool."""
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize the puller.
+
+        Args:
+            session: Pooled client session; any session works, including
+                one pointed at a local stub server
+        """
+        self._session = session
+        self._timeout = aiohttp.ClientTimeout(total=PULL_TIMEOUT)
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, asyncio.Task[tuple[bytes, str] | None]] = {}
+        self.pulls = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    async def async_pull(self, camera_id: str, url: str) -> tuple[bytes, str] | None:
+        """Fetch a camera's current snapshot.
+
+        Calls for a camera that already has a fetch in flight wait for
+        that fetch instead of starting another.
+
+        Args:
+            camera_id: Permanent camera UUID
+            url: Snapshot URL, optionally with credentials
+
+        Returns:
+            Image bytes and content type, or None if the fetch failed.
+        """
+        task = self._in_flight.get(camera_id)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._async_fetch(url))
+        self._in_flight[camera_id] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(camera_id, None))
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, url: str) -> tuple[bytes, str] | None:
+        """Run one request under its host's concurrency limit."""
+        parsed = URL(url)
+        host = f"{parsed.host}:{parsed.port}"
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(PULL_MAX_PER_HOST))
+
+        self.pulls += 1
+        try:
+            async with limit, self._session.get(url, timeout=self._timeout) as response:
+                response.raise_for_status()
+                content_type = response.content_type
+                if not content_type.startswith("image/"):
+                    raise ValueError(f"unexpected content type {content_type}")
+                if (response.content_length or 0) > MAX_EVENT_FRAME_BYTES:
+                    raise ValueError(f"{response.content_length} byte snapshot too large")
+                buffer = bytearray()
+                async for chunk in response.content.iter_chunked(IMAGE_READ_CHUNK):
+                    buffer += chunk
+                    if len(buffer) > MAX_EVENT_FRAME_BYTES:
+                        raise ValueError("snapshot too large")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self.failures += 1
+            _LOGGER.warning(
+                "Failed to pull snapshot from %s: %s",
+                parsed.with_user(None),
+                str(e) or type(e).__name__,
+            )
+            return None
+
+        if not buffer:
+            self.failures += 1
+            return None
+        return bytes(buffer), content_type
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return pull counters for diagnostics."""
+        return {
+            "pulls": self.pulls,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,220 @@
+"""Sensor platform for TP-Link VIGI cameras."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .activity import ActivityTracker
+from .const import (
+    CONF_CAMERA_ID,
+    DOMAIN,
+    SIGNAL_ACTIVITY_SWEEP,
+    SIGNAL_CAMERA_EVENT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up sensors from config entry."""
+    cameras = entry.data.get("cameras", [])
+
+    sensors: list[VigiCameraSensor] = []
+
+    for camera in cameras:
+        camera_name: str = camera[CONF_NAME]
+        camera_id: str = camera.get(CONF_CAMERA_ID, "")
+
+        # Ensure camera_id exists (should be set by binary_sensor platform)
+        if not camera_id:
+            _LOGGER.warning(
+                "Camera '%s' missing camera_id. Sensors not created.",
+                camera_name,
+            )
+            continue
+
+        sensors.append(VigiClockSkewSensor(hass, entry, camera_id, camera_name))
+        sensors.append(VigiEventRateSensor(hass, entry, camera_id, camera_name))
+        sensors.append(VigiSilenceSensor(hass, entry, camera_id, camera_name))
+
+    async_add_entities(sensors)
+
+
+class VigiCameraSensor(SensorEntity):
+    """Base class for sensors derived from a VIGI camera's webhook events."""
+
+    _attr_has_entity_name = False
+    _attr_should_poll = False
+    _key: str
+    # Also refresh on the shared activity sweep, for time-dependent values
+    _refresh_on_sweep = False
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        self._hass = hass
+        self._entry = entry
+        self._camera_id = camera_id
+        self._camera_name = camera_name
+        self._attr_unique_id = f"{entry.entry_id}_{camera_id}_{self._key}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information about this camera."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._camera_id)},
+            name=self._camera_name,
+            manufacturer="TP-Link",
+            model="VIGI Camera",
+        )
+
+    def _get_camera_data(self) -> dict[str, Any] | None:
+        """Return this camera's runtime data, or None if it was removed."""
+        entry_data = self._hass.data[DOMAIN].get(self._entry.entry_id)
+        if not entry_data:
+            return None
+        camera_data: dict[str, Any] | None = entry_data["cameras"].get(self._camera_id)
+        return camera_data
+
+    def _get_tracker(self) -> ActivityTracker | None:
+        """Return this camera's activity tracker, or None if it was removed."""
+        camera_data = self._get_camera_data()
+        if not camera_data:
+            return None
+        tracker: ActivityTracker = camera_data["activity"]
+        return tracker
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh whenever the camera processes an event."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass,
+                SIGNAL_CAMERA_EVENT.format(self._camera_id),
+                self._async_camera_event,
+            )
+        )
+        if self._refresh_on_sweep:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self._hass, SIGNAL_ACTIVITY_SWEEP, self._async_camera_event
+                )
+            )
+
+    @callback
+    def _async_camera_event(self) -> None:
+        """Write the new state after an event."""
+        self.async_write_ha_state()
+
+
+class VigiClockSkewSensor(VigiCameraSensor):
+    """How far the camera's clock is ahead (+) or behind (-) Home Assistant."""
+
+    _key = "clock_skew"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:clock-alert-outline"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, entry, camera_id, camera_name)
+        self._attr_name = f"{camera_name} Clock Skew"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median skew over recent events."""
+        camera_data = self._get_camera_data()
+        if not camera_data:
+            return None
+        skew: float | None = camera_data["skew"].skew
+        return skew
+
+
+class VigiEventRateSensor(VigiCameraSensor):
+    """Webhooks per minute, as a continuously decaying moving average."""
+
+    _key = "event_rate"
+    _attr_native_unit_of_measurement = "events/min"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _attr_icon = "mdi:pulse"
+    _refresh_on_sweep = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, entry, camera_id, camera_name)
+        self._attr_name = f"{camera_name} Event Rate"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current event rate."""
+        tracker = self._get_tracker()
+        if tracker is None:
+            return None
+        return round(tracker.events_per_minute, 3)
+
+
+class VigiSilenceSensor(VigiCameraSensor):
+    """Time since the camera last posted a webhook."""
+
+    _key = "silence"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sand"
+    _refresh_on_sweep = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        camera_id: str,
+        camera_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, entry, camera_id, camera_name)
+        self._attr_name = f"{camera_name} Time Since Last Webhook"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return whole seconds since the last webhook (unknown before the first)."""
+        tracker = self._get_tracker()
+        if tracker is None or tracker.silence is None:
+            return None
+        return int(tracker.silence)
@@ -0,0 +1,136 @@
+"""Services for the TP-Link VIGI integration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .capture import WebhookHandler, async_replay
+from .const import (
+    ATTR_CAMERA,
+    ATTR_CURSOR,
+    ATTR_END,
+    ATTR_EVENT_TYPE,
+    ATTR_LIMIT,
+    ATTR_PATH,
+    ATTR_SPEED,
+    ATTR_START,
+    CAPTURE_DIR,
+    DATA_HISTORY,
+    DEFAULT_QUERY_LIMIT,
+    DOMAIN,
+    MAX_QUERY_LIMIT,
+    SERVICE_QUERY_EVENTS,
+    SERVICE_REPLAY_CAPTURE,
+)
+from .history import EventHistory
+
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+QUERY_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CAMERA): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_EVENT_TYPE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_LIMIT)
+        ),
+        vol.Optional(ATTR_CURSOR): cv.string,
+    }
+)
+
+
+def _iter_cameras(hass: HomeAssistant) -> list[tuple[str, dict[str, Any]]]:
+    """Return (camera_id, camera_data) for every loaded camera."""
+    return [
+        (camera_id, camera_data)
+        for entry_data in hass.data[DOMAIN].values()
+        for camera_id, camera_data in entry_data.get("cameras", {}).items()
+    ]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+
+    async def async_handle_replay_capture(call: ServiceCall) -> None:
+        """Replay a raw webhook capture archive through the live handlers."""
+        # The integration's own capture directory is always readable; only
+        # paths supplied by the caller must be allowlisted
+        if path := call.data.get(ATTR_PATH):
+            root = Path(path)
+            if not hass.config.is_allowed_path(str(root)):
+                raise HomeAssistantError(
+                    f"Path {root} is not in allowlist_external_dirs"
+                )
+        else:
+            root = Path(hass.config.path(DOMAIN, CAPTURE_DIR))
+
+        handlers: dict[str, WebhookHandler] = {
+            camera_id: camera_data["handler"]
+            for camera_id, camera_data in _iter_cameras(hass)
+            if camera_data.get("handler") is not None
+        }
+
+        await async_replay(hass, root, handlers, call.data[ATTR_SPEED])
+
+    async def async_handle_query_events(call: ServiceCall) -> ServiceResponse:
+        """Return one page of stored events, newest first."""
+        history: EventHistory = hass.data[DATA_HISTORY]
+
+        # Cameras may be given by name or by camera_id; ids of cameras that
+        # are no longer configured still match their stored history
+        camera_ids: list[str] | None = None
+        if ATTR_CAMERA in call.data:
+            by_name = {
+                camera_data.get("name", "").lower(): camera_id
+                for camera_id, camera_data in _iter_cameras(hass)
+            }
+            camera_ids = [
+                by_name.get(camera.lower(), camera) for camera in call.data[ATTR_CAMERA]
+            ]
+
+        try:
+            result = await history.async_query(
+                camera_ids,
+                call.data.get(ATTR_START),
+                call.data.get(ATTR_END),
+                call.data.get(ATTR_EVENT_TYPE),
+                call.data[ATTR_LIMIT],
+                call.data.get(ATTR_CURSOR),
+            )
+        except ValueError as e:
+            raise ServiceValidationError(f"Invalid cursor: {e}") from e
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_CAPTURE,
+        async_handle_replay_capture,
+        schema=REPLAY_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_EVENTS,
+        async_handle_query_events,
+        schema=QUERY_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
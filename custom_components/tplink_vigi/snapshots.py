@@ -0,0 +1,240 @@
+"""Stored snapshots for TP-Link VIGI cameras.
+
+Cameras with snapshot storage enabled keep each new (non-duplicate)
+snapshot as a file under ``<config>/tplink_vigi/snapshots/<camera>/<day>/``.
+Files are written in the executor and only then indexed in the event
+history database, so the index never points at a missing file. Day
+directories older than SNAPSHOT_RETENTION_DAYS are pruned once a day.
+
+Thumbnails for the media browser are downscaled on first request and
+kept in a bounded in-memory LRU cache.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+import io
+import logging
+from pathlib import Path
+import shutil
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_SNAPSHOTS,
+    DOMAIN,
+    SNAPSHOT_RETENTION_DAYS,
+    THUMBNAIL_CACHE_SIZE,
+    THUMBNAIL_SIZE,
+)
+from .history import EventHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+_EXTENSIONS = {"image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
+
+SNAPSHOT_URL = f"/api/{DOMAIN}/snapshot"
+THUMBNAIL_URL = f"/api/{DOMAIN}/thumbnail"
+
+
+def make_thumbnail(image_bytes: bytes) -> bytes:
+    """Downscale an image to a JPEG thumbnail (executor).
+
+    Falls back to the original bytes if the image cannot be decoded or
+    Pillow is unavailable.
+    """
+    try:
+        from PIL import Image, UnidentifiedImageError
+    except ImportError:
+        return image_bytes
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # draft() lets the JPEG decoder downscale while decoding
+            img.draft("RGB", THUMBNAIL_SIZE)
+            img.thumbnail(THUMBNAIL_SIZE)
+            out = io.BytesIO()
+            img.convert("RGB").save(out, "JPEG", quality=75)
+            return out.getvalue()
+    except (UnidentifiedImageError, OSError, ValueError):
+        return image_bytes
+
+
+class SnapshotStore:
+    """On-disk snapshot archive indexed in the event history."""
+
+    def __init__(self, hass: HomeAssistant, root: Path, history: EventHistory) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            root: Directory snapshots are written under
+            history: Event history holding the snapshot index
+        """
+        self._hass = hass
+        self._root = root
+        self._history = history
+        self._pruned_on: date | None = None
+        self._thumbnails: OrderedDict[str, bytes] = OrderedDict()
+        self.stored = 0
+        self.thumbnail_hits = 0
+        self.thumbnail_misses = 0
+
+    async def async_save(
+        self,
+        camera_id: str,
+        event_time: datetime,
+        digest: bytes,
+        image_bytes: bytes,
+        content_type: str,
+    ) -> None:
+        """Write a snapshot to disk and index it.
+
+        Args:
+            camera_id: Permanent camera UUID
+            event_time: Event time the snapshot belongs to
+            digest: Ingest digest of the snapshot
+            image_bytes: Image body
+            content_type: MIME type of the image
+        """
+        local = dt_util.as_local(event_time)
+        path = (
+            f"{camera_id}/{local:%Y%m%d}/{local:%H%M%S}_{digest.hex()[:12]}"
+            f"{_EXTENSIONS.get(content_type, '.jpg')}"
+        )
+        try:
+            await self._hass.async_add_executor_job(
+                self._write, self._root / path, image_bytes
+            )
+        except OSError as e:
+            _LOGGER.error("Failed to store snapshot %s: %s", path, e)
+            return
+
+        self._history.async_append_snapshot(camera_id, event_time, path, content_type)
+        self.stored += 1
+
+        today = dt_util.now().date()
+        if self._pruned_on != today:
+            self._pruned_on = today
+            self._hass.async_create_background_task(
+                self._async_prune(today), "tplink_vigi snapshot prune"
+            )
+
+    @staticmethod
+    def _write(path: Path, image_bytes: bytes) -> None:
+        """Write one snapshot file (executor)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(image_bytes)
+
+    async def _async_prune(self, today: date) -> None:
+        """Remove snapshots older than the retention period."""
+        cutoff = today - timedelta(days=SNAPSHOT_RETENTION_DAYS)
+        await self._history.async_prune_snapshots(dt_util.start_of_local_day(cutoff))
+        removed = await self._hass.async_add_executor_job(
+            self._remove_days_before, f"{cutoff:%Y%m%d}"
+        )
+        if removed:
+            _LOGGER.debug("Pruned %d day(s) of stored snapshots", removed)
+
+    def _remove_days_before(self, cutoff: str) -> int:
+        """Delete day directories older than ``cutoff`` (executor)."""
+        if not self._root.is_dir():
+            return 0
+        removed = 0
+        for camera_dir in self._root.iterdir():
+            if not camera_dir.is_dir():
+                continue
+            for day_dir in camera_dir.iterdir():
+                if day_dir.is_dir() and day_dir.name < cutoff:
+                    shutil.rmtree(day_dir, ignore_errors=True)
+                    removed += 1
+        return removed
+
+    def resolve(self, path: str) -> Path | None:
+        """Map a relative snapshot path to its file, refusing escapes."""
+        target = (self._root / path).resolve()
+        if not target.is_relative_to(self._root.resolve()) or not target.is_file():
+            return None
+        return target
+
+    async def async_thumbnail(self, path: str) -> bytes | None:
+        """Return a cached thumbnail of a stored snapshot."""
+        cached = self._thumbnails.get(path)
+        if cached is not None:
+            self._thumbnails.move_to_end(path)
+            self.thumbnail_hits += 1
+            return cached
+
+        target = await self._hass.async_add_executor_job(self.resolve, path)
+        if target is None:
+            return None
+        self.thumbnail_misses += 1
+        thumbnail: bytes = await self._hass.async_add_executor_job(
+            self._read_thumbnail, target
+        )
+        self._thumbnails[path] = thumbnail
+        if len(self._thumbnails) > THUMBNAIL_CACHE_SIZE:
+            self._thumbnails.popitem(last=False)
+        return thumbnail
+
+    @staticmethod
+    def _read_thumbnail(target: Path) -> bytes:
+        """Read and downscale a snapshot (executor)."""
+        return make_thumbnail(target.read_bytes())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return store counters for diagnostics."""
+        return {
+            "stored": self.stored,
+            "thumbnails_cached": len(self._thumbnails),
+            "thumbnail_hits": self.thumbnail_hits,
+            "thumbnail_misses": self.thumbnail_misses,
+        }
+
+
+class SnapshotView(HomeAssistantView):
+    """Serve a stored snapshot file."""
+
+    url = SNAPSHOT_URL + "/{path:.+}"
+    name = f"api:{DOMAIN}:snapshot"
+
+    async def get(self, request: web.Request, path: str) -> web.StreamResponse:
+        """Return the snapshot at ``path``."""
+        hass: HomeAssistant = request.app["hass"]
+        store: SnapshotStore | None = hass.data.get(DATA_SNAPSHOTS)
+        if store is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        target = await hass.async_add_executor_job(store.resolve, path)
+        if target is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        return web.FileResponse(target)
+
+
+class ThumbnailView(HomeAssistantView):
+    """Serve a cached thumbnail of a stored snapshot."""
+
+    url = THUMBNAIL_URL + "/{path:.+}"
+    name = f"api:{DOMAIN}:thumbnail"
+
+    async def get(self, request: web.Request, path: str) -> web.Response:
+        """Return the thumbnail for the snapshot at ``path``."""
+        hass: HomeAssistant = request.app["hass"]
+        store: SnapshotStore | None = hass.data.get(DATA_SNAPSHOTS)
+        if store is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        thumbnail = await store.async_thumbnail(path)
+        if thumbnail is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+        # Snapshot files never change once written
+        return web.Response(
+            body=thumbnail,
+            content_type="image/jpeg",
+            headers={"Cache-Control": "private, max-age=86400"},
+        )
@@ -0,0 +1,101 @@
+"""Shared MJPEG fan-out buffer for TP-Link VIGI snapshots.
+
+Every received snapshot is encoded once into a ready-to-send MJPEG part
+and appended to a small ring. Viewers keep their own cursor into the
+ring and all write the same bytes object, so adding a viewer costs no
+extra copies. A viewer that falls behind the ring jumps straight to the
+newest frame, dropping what it missed instead of queueing it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+
+from .const import MJPEG_BOUNDARY, MJPEG_BUFFER_FRAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FrameBroadcaster:
+    """Latest-frames ring shared by all MJPEG viewers of one camera."""
+
+    def __init__(self) -> None:
+        """Initialize an empty broadcaster."""
+        self._chunks: deque[tuple[int, bytes]] = deque(maxlen=MJPEG_BUFFER_FRAMES)
+        self._seq = 0
+        self._new_frame = asyncio.Event()
+        self._closed = False
+        self.viewers = 0
+        self.published = 0
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the camera has been removed."""
+        return self._closed
+
+    def publish(self, image_bytes: bytes, content_type: str) -> None:
+        """Add a frame and wake waiting viewers.
+
+        Args:
+            image_bytes: Encoded snapshot
+            content_type: MIME type of the snapshot
+        """
+        header = (
+            f"--{MJPEG_BOUNDARY}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(image_bytes)}\r\n\r\n"
+        ).encode("ascii")
+        self._seq += 1
+        self._chunks.append((self._seq, b"".join((header, image_bytes, b"\r\n"))))
+        self.published += 1
+        self._wake()
+
+    def latest(self) -> tuple[int, bytes | None]:
+        """Return the newest frame and its sequence number."""
+        if not self._chunks:
+            return self._seq, None
+        return self._chunks[-1]
+
+    async def async_next(self, cursor: int, timeout: float) -> tuple[int, bytes | None]:
+        """Return the frame a viewer at ``cursor`` should send next.
+
+        That is the frame right after ``cursor``, or the newest frame if
+        the ring has already dropped that one. Waits up to ``timeout``
+        seconds for a new frame to arrive.
+
+        Args:
+            cursor: Sequence number of the last frame the viewer sent
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            (sequence, chunk), or (cursor, None) on timeout or close.
+        """
+        if self._seq <= cursor and not self._closed:
+            try:
+                await asyncio.wait_for(self._new_frame.wait(), timeout)
+            except asyncio.TimeoutError:
+                return cursor, None
+
+        if not self._chunks:
+            return cursor, None
+        oldest = self._chunks[0][0]
+        if cursor < oldest - 1:
+            # Missed frames are gone; catch up instead of replaying the ring
+            return self.latest()
+        for seq, chunk in self._chunks:
+            if seq > cursor:
+                return seq, chunk
+        return cursor, None
+
+    def close(self) -> None:
+        """Stop all viewers."""
+        self._closed = True
+        self._chunks.clear()
+        self._wake()
+
+    def _wake(self) -> None:
+        """Release every viewer waiting on the current event."""
+        self._new_frame.set()
+        self._new_frame = asyncio.Event()